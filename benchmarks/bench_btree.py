@@ -0,0 +1,48 @@
+"""
+Compare BTree against RedBlackTree for primitive keys.
+
+    python benchmarks/bench_btree.py [n] [fanout]
+"""
+import random
+import sys
+import time
+from typing import Any, Callable
+from rbtree.btree import BTree
+from rbtree.rbtree import RedBlackTree
+
+
+def timed(label: str, func: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"  {label:<8} {time.perf_counter() - start:8.3f}s")
+
+
+def run(tree: Any, keys: list, probes: list) -> None:
+    timed("insert", lambda: [tree.insert(key) for key in keys])
+    timed("search", lambda: [tree.search(key) for key in probes])
+    timed("iterate", lambda: list(tree.irange()))
+    timed("delete", lambda: [tree.delete(key) for key in probes])
+
+
+def main(n: int = 200000, fanout: int = 64) -> None:
+    random.seed(0)
+    keys = random.sample(range(n * 10), n)
+    probes = random.sample(keys, n // 2)
+
+    print(f"RedBlackTree, n={n}")
+    rbtree = RedBlackTree()
+    run(rbtree, keys, probes)
+    print(f"  nodes    {n:8d}")
+
+    print(f"BTree, n={n}, fanout={fanout}")
+    btree = BTree(fanout)
+    run(btree, keys, probes)
+    btree = BTree(fanout)
+    for key in keys:
+        btree.insert(key)
+    print(f"  nodes    {btree.node_count():8d}")
+    print(f"  height   {btree.height():8d}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,79 @@
+"""
+Load a directory of CFB entry names into a tree, comparing a node which
+recomputes the CFB ordering on every comparison with CfbNameNode.
+
+    python benchmarks/bench_cfb.py [n]
+"""
+import random
+import string
+import sys
+import time
+from typing import Any, Callable, TypeVar
+from rbtree.cfb import CfbNameNode, cfb_sort_key
+from rbtree.node_base import NodeBase
+from rbtree.rbtree import RedBlackTree
+
+
+T = TypeVar('T', bound='NaiveNameNode')
+
+
+class NaiveNameNode(NodeBase):
+    """
+    Uppercases and encodes both names on every comparison.
+    """
+
+    def __init__(self: T, name: str) -> None:
+        super().__init__()
+        self.name = name
+
+    @property
+    def key(self: T) -> Any:
+        return self.name
+
+    def _order(self: T) -> tuple:
+        encoded = self.name.upper().encode("utf-16-be")
+        return (len(encoded), encoded)
+
+    def __lt__(self: T, other: Any) -> bool:
+        return self._order() < other._order()
+
+    def __eq__(self: T, other: Any) -> bool:
+        if not isinstance(other, NaiveNameNode):
+            return False
+        return self._order() == other._order()
+
+
+def timed(label: str, workload: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    workload()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main(n: int = 100000) -> None:
+    random.seed(0)
+    alphabet = string.ascii_letters + string.digits + " _"
+    names = list({
+        "".join(random.choices(alphabet, k=random.randint(1, 31)))
+        for _ in range(n)
+    })
+    print(f"CFB directory, n={len(names)}")
+
+    naive = RedBlackTree()
+    timed("naive insert", lambda: naive.insert_many(
+        NaiveNameNode(name) for name in names))
+    timed("naive search", lambda: [
+        naive.search(NaiveNameNode(name)) for name in names])
+
+    cfb_sort_key.cache_clear()
+    packed = RedBlackTree()
+    timed("CfbNameNode insert", lambda: packed.insert_many(
+        CfbNameNode(name) for name in names))
+    timed("CfbNameNode search", lambda: [
+        packed.search(cfb_sort_key(name)) for name in names])
+    assert packed.is_valid()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,87 @@
+"""
+Measure cyclic garbage collector pauses during a high-churn workload,
+with and without a node pool and gc_freeze.
+
+    python benchmarks/bench_gc.py [n] [operations]
+
+A tree of n keys is built, then each operation deletes a random key and
+inserts a new one. Each operation also leaves behind one reference
+cycle, as application code does, so that collections keep happening.
+Pauses are reported for the build and the churn separately.
+"""
+import gc
+import random
+import sys
+import time
+from typing import Any, TypeVar
+from rbtree.rbtree import RedBlackTree
+
+
+T = TypeVar('T', bound='PauseRecorder')
+
+
+class PauseRecorder():
+    """
+    Time each collection through gc.callbacks.
+    """
+
+    def __init__(self: T) -> None:
+        self.pauses: list[float] = []
+        self._start = 0.0
+
+    def __call__(self: T, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self._start)
+
+
+def report(label: str, elapsed: float, pauses: list[float]) -> None:
+    total = sum(pauses)
+    longest = max(pauses, default=0.0)
+    print(f"  {label:<24} {elapsed:8.3f}s  {len(pauses):5d} collections"
+          f"  gc {total * 1000:9.2f}ms  max pause {longest * 1000:7.2f}ms")
+
+
+def run(label: str, n: int, operations: int, **options: Any) -> None:
+    frozen = options.pop("gc_freeze", False)
+    random.seed(0)
+    gc.collect()
+    recorder = PauseRecorder()
+    gc.callbacks.append(recorder)
+    try:
+        start = time.perf_counter()
+        bst = RedBlackTree(**options)
+        live = random.sample(range(n * 10), n)
+        bst.insert_many(live)
+        report(label + " build", time.perf_counter() - start,
+               recorder.pauses)
+        if frozen:
+            bst.gc_freeze()
+
+        recorder.pauses = []
+        start = time.perf_counter()
+        for i in range(operations):
+            j = random.randrange(n)
+            bst.delete(live[j])
+            live[j] = n * 10 + i
+            bst.insert(live[j])
+            cycle: list = []
+            cycle.append(cycle)
+        report(label + " churn", time.perf_counter() - start,
+               recorder.pauses)
+    finally:
+        gc.callbacks.remove(recorder)
+        if frozen:
+            gc.unfreeze()
+
+
+def main(n: int = 200000, operations: int = 200000) -> None:
+    print(f"Churn on RedBlackTree, n={n}, operations={operations}")
+    run("no pool", n, operations)
+    run("pool", n, operations, pool_size=1024)
+    run("pool + gc_freeze", n, operations, pool_size=1024, gc_freeze=True)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,43 @@
+"""
+Compare exact-match lookup latency and memory with and without the hash
+index.
+
+    python benchmarks/bench_hash_index.py [n] [lookups]
+
+Half of the lookups are for keys which are not in the tree.
+"""
+import random
+import sys
+import time
+from typing import Any
+from rbtree.rbtree import RedBlackTree
+
+
+def run(label: str, keys: list, probes: list, **options: Any) -> None:
+    bst = RedBlackTree(**options)
+    bst.insert_many(keys)
+    start = time.perf_counter()
+    found = sum(1 for probe in probes if probe in bst)
+    elapsed = time.perf_counter() - start
+    usage = bst.memory_usage()
+    print(f"  {label:<24} {elapsed / len(probes) * 1e9:8.0f}ns per lookup"
+          f"  {found:8d} found  auxiliary {usage['auxiliary']:>12,d}"
+          f"  total {usage['total']:>12,d}")
+
+
+def main(n: int = 200000, lookups: int = 200000) -> None:
+    random.seed(0)
+    ints = random.sample(range(n * 2), n)
+    int_probes = [random.randrange(n * 2) for _ in range(lookups)]
+    strings = [f"user/{key:012d}" for key in ints]
+    string_probes = [f"user/{key:012d}" for key in int_probes]
+
+    print(f"Exact-match lookups, n={n}, lookups={lookups}")
+    run("int keys", ints, int_probes)
+    run("int keys, hash index", ints, int_probes, hash_index=True)
+    run("str keys", strings, string_probes)
+    run("str keys, hash index", strings, string_probes, hash_index=True)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
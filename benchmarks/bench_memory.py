@@ -0,0 +1,52 @@
+"""
+Record tracemalloc peaks for insert and delete workloads.
+
+    python benchmarks/bench_memory.py [n] [max bytes per node]
+
+Exits with status 1 if the memory held per node after inserting exceeds
+the budget, so a node layout regression fails the run.
+"""
+import random
+import sys
+import tracemalloc
+from typing import Callable
+from rbtree.rbtree import RedBlackTree
+
+
+def measure(label: str, n: int, workload: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        workload()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    held = current - start
+    print(f"  {label:<8} held {held:>12,d}  peak {peak - start:>12,d}"
+          f"  per node {held / n:8.1f}")
+    return held
+
+
+def main(n: int = 100000, budget: int = 600) -> int:
+    random.seed(0)
+    keys = random.sample(range(n * 10), n)
+    bst = RedBlackTree()
+
+    print(f"RedBlackTree, n={n}")
+    held = measure("insert", n, lambda: bst.insert_many(keys))
+    measure("delete", n, lambda: bst.delete_many(keys[:n // 2]))
+
+    usage = bst.memory_usage(deep=True)
+    print(f"  memory_usage  {usage['total']:>12,d} for {usage['count']}"
+          " nodes")
+    print(f"  per node      {usage['per_node']}")
+
+    if held / n > budget:
+        print(f"Over budget of {budget} bytes per node")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
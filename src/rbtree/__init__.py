@@ -1,2 +1,17 @@
+from .augmentation import Augmentation
+from .bounded import BoundedRedBlackTree
+from .btree import BTree
+from .durable import Durability, DurableRedBlackTree
+from .frozen import FrozenTree
+from .llrb import LeftLeaningRedBlackTree
+from .merge import merge
+from .paged import PagedRedBlackTree
 from .rbtree import RedBlackTree
-__all__ = ['RedBlackTree',]
+from .sharded import ShardedRedBlackTree
+from .shared import SharedTree, SharedTreeWriter
+__all__ = [
+    'Augmentation', 'BTree', 'BoundedRedBlackTree', 'Durability',
+    'DurableRedBlackTree', 'FrozenTree', 'LeftLeaningRedBlackTree',
+    'PagedRedBlackTree', 'RedBlackTree', 'ShardedRedBlackTree', 'SharedTree',
+    'SharedTreeWriter', 'merge',
+]
@@ -0,0 +1,80 @@
+import operator
+from typing import Any, Callable, Optional, TypeVar
+from rbtree.node_base import NodeBase
+
+
+T = TypeVar('T', bound='Augmentation')
+
+
+class _Empty:
+    """
+    Marker for the aggregate of an empty subtree.
+    """
+
+    def __repr__(self: '_Empty') -> str:
+        return "EMPTY"
+
+
+EMPTY = _Empty()
+
+
+def _key_value(node: NodeBase) -> Any:
+    return getattr(node, "key")
+
+
+class Augmentation():
+    """
+    Maintain a per-node aggregate of every subtree in a RedBlackTree.
+
+    The combine function must be associative. It does not need to be
+    commutative; values are always combined in key order.
+    """
+
+    def __init__(self: T, combine: Callable[[Any, Any], Any],
+                 value: Optional[Callable[[NodeBase], Any]] = None) -> None:
+        self.combine = combine
+        self.value = _key_value if value is None else value
+
+    @classmethod
+    def sum(cls: type[T],
+            value: Optional[Callable[[NodeBase], Any]] = None) -> T:
+        return cls(operator.add, value)
+
+    @classmethod
+    def min(cls: type[T],
+            value: Optional[Callable[[NodeBase], Any]] = None) -> T:
+        return cls(min, value)
+
+    @classmethod
+    def max(cls: type[T],
+            value: Optional[Callable[[NodeBase], Any]] = None) -> T:
+        return cls(max, value)
+
+    def merge(self: T, left: Any, right: Any) -> Any:
+        """
+        Combine two partial aggregates, either of which may be EMPTY.
+        """
+        if left is EMPTY:
+            return right
+        if right is EMPTY:
+            return left
+        return self.combine(left, right)
+
+    def of(self: T, node: NodeBase) -> Any:
+        """
+        The aggregate of the subtree rooted at node.
+        """
+        return EMPTY if node.is_null() else node.aggregate
+
+    def own(self: T, node: NodeBase) -> Any:
+        """
+        The value of node alone, or EMPTY if it has been lazily deleted.
+        """
+        return EMPTY if node.is_deleted() else self.value(node)
+
+    def update(self: T, node: NodeBase) -> None:
+        """
+        Recompute the aggregate of node from its children.
+        """
+        agg = self.merge(self.of(node.left), self.own(node))
+        node.aggregate = self.merge(agg, self.of(node.right))
@@ -0,0 +1,51 @@
+from typing import Any, TypeVar
+from rbtree.rbtree import RedBlackTree
+
+
+T = TypeVar('T', bound='BoundedRedBlackTree')
+
+
+class BoundedRedBlackTree(RedBlackTree):
+    """
+    A RedBlackTree which holds at most capacity nodes, for tracking the
+    top k of a stream.
+
+    With evict="min" the largest keys are kept: once the tree is full, a
+    key no greater than the minimum is rejected in O(1) using the cached
+    extreme, and otherwise the minimum is evicted to make room.
+    evict="max" keeps the smallest keys instead. Any other options are
+    passed to the RedBlackTree constructor.
+    """
+
+    def __init__(self: T, capacity: int, evict: str = "min",
+                 **options: Any) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        if evict not in ("min", "max"):
+            raise ValueError("evict must be 'min' or 'max'")
+        super().__init__(**options)
+        self.capacity = capacity
+        self.evict = evict
+        self.evictions = 0
+        self.rejections = 0
+
+    def insert(self: T, key: Any) -> None:
+        if self.size < self.capacity:
+            super().insert(key)
+            return
+        node = self._make_node(key)
+        if self.evict == "min":
+            if not self.peek_min() < node:
+                self.rejections += 1
+                return
+        elif not node < self.peek_max():
+            self.rejections += 1
+            return
+        size = self.size
+        super().insert(node)
+        if self.size > size:
+            if self.evict == "min":
+                self.pop_min()
+            else:
+                self.pop_max()
+            self.evictions += 1
@@ -0,0 +1,377 @@
+import bisect
+from typing import Any, Iterator, Optional, TypeVar
+
+
+N = TypeVar('N', bound='BTreeNode')
+T = TypeVar('T', bound='BTree')
+
+
+class BTreeNode():
+    """
+    A node holding a sorted list of keys. An internal node with k keys has
+    k + 1 children; a leaf has none.
+    """
+    __slots__ = ("keys", "children")
+
+    def __init__(self: N) -> None:
+        self.keys: list = []
+        self.children: list[BTreeNode] = []
+
+    def __repr__(self: N) -> str:
+        return "Keys: " + str(self.keys)
+
+    def is_leaf(self: N) -> bool:
+        return not self.children
+
+
+class BTree():
+    """
+    A sorted set which packs many keys into each node.
+
+    A red-black tree is a binary encoding of a 2-3-4 tree. This is the
+    general B-tree, in which every node other than the root holds between
+    fanout / 2 - 1 and fanout - 1 keys. Searching within a node uses
+    bisect on a list, so the tree is both shallower and has far fewer
+    objects than a RedBlackTree. Keys are compared directly.
+    """
+
+    def __init__(self: T, fanout: int = 64) -> None:
+        if fanout < 4 or fanout % 2:
+            raise ValueError("Fanout must be an even number of at least 4")
+        self.fanout = fanout
+        # The minimum degree, t, in CLRS.
+        self._t = fanout // 2
+        self.root = BTreeNode()
+        self.size = 0
+
+    # Dunder Methods
+
+    def __len__(self: T) -> int:
+        return self.size
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self.search(key) is not None
+
+    def __iter__(self: T) -> Iterator:
+        return self.irange()
+
+    # Public Methods
+
+    def search(self: T, key: Any) -> Optional[BTreeNode]:
+        """
+        Find the node which holds key, or None.
+        """
+        node = self.root
+        while True:
+            i = bisect.bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                return node
+            if node.is_leaf():
+                return None
+            node = node.children[i]
+
+    def minimum(self: T) -> Any:
+        """
+        The smallest key, or None if the tree is empty.
+        """
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+        return node.keys[0] if node.keys else None
+
+    def maximum(self: T) -> Any:
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[-1]
+        return node.keys[-1] if node.keys else None
+
+    def successor(self: T, key: Any) -> Any:
+        """
+        The smallest key greater than key, or None.
+        """
+        best = None
+        node = self.root
+        while True:
+            i = bisect.bisect_right(node.keys, key)
+            if i < len(node.keys):
+                best = node.keys[i]
+            if node.is_leaf():
+                return best
+            node = node.children[i]
+
+    def predecessor(self: T, key: Any) -> Any:
+        """
+        The largest key less than key, or None.
+        """
+        best = None
+        node = self.root
+        while True:
+            i = bisect.bisect_left(node.keys, key)
+            if i > 0:
+                best = node.keys[i - 1]
+            if node.is_leaf():
+                return best
+            node = node.children[i]
+
+    def insert(self: T, key: Any) -> None:
+        root = self.root
+        if len(root.keys) == 2 * self._t - 1:
+            self.root = BTreeNode()
+            self.root.children.append(root)
+            self._split_child(self.root, 0)
+        if self._insert_nonfull(self.root, key):
+            self.size += 1
+
+    def delete(self: T, key: Any) -> None:
+        if self.search(key) is None:
+            return
+        self._delete(self.root, key)
+        if not self.root.keys and not self.root.is_leaf():
+            self.root = self.root.children[0]
+        self.size -= 1
+
+    def inorder(self: T) -> list:
+        return list(self.irange())
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator:
+        """
+        Lazily iterate over the keys between lo and hi.
+        """
+        if reverse:
+            return self._iter_reverse(lo, hi, inclusive)
+        return self._iter_forward(lo, hi, inclusive)
+
+    def height(self: T) -> int:
+        height = 0
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+            height += 1
+        return height
+
+    def node_count(self: T) -> int:
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children)
+        return count
+
+    def is_valid(self: T) -> bool:
+        """
+        Check the key counts, key order and that all leaves are at the
+        same depth.
+        """
+        leaf_depths = set()
+        # Each entry is a node, its depth and its exclusive key bounds.
+        stack: list[tuple[BTreeNode, int, Any, Any]] = [
+            (self.root, 0, None, None)
+        ]
+        while stack:
+            node, depth, lo, hi = stack.pop()
+            keys = node.keys
+            if node is not self.root and len(keys) < self._t - 1:
+                return False
+            if len(keys) > 2 * self._t - 1:
+                return False
+            if any(not a < b for a, b in zip(keys, keys[1:])):
+                return False
+            if keys and lo is not None and not lo < keys[0]:
+                return False
+            if keys and hi is not None and not keys[-1] < hi:
+                return False
+            if node.is_leaf():
+                leaf_depths.add(depth)
+                continue
+            if len(node.children) != len(keys) + 1:
+                return False
+            bounds = [lo] + keys + [hi]
+            for i, child in enumerate(node.children):
+                stack.append((child, depth + 1, bounds[i], bounds[i + 1]))
+        return len(leaf_depths) == 1
+
+    # Protected Methods
+
+    def _split_child(self: T, x: BTreeNode, i: int) -> None:
+        """
+        Split the full child i of x, moving its median key up into x.
+        """
+        t = self._t
+        y = x.children[i]
+        z = BTreeNode()
+        z.keys = y.keys[t:]
+        median = y.keys[t - 1]
+        y.keys = y.keys[:t - 1]
+        if not y.is_leaf():
+            z.children = y.children[t:]
+            y.children = y.children[:t]
+        x.keys.insert(i, median)
+        x.children.insert(i + 1, z)
+
+    def _insert_nonfull(self: T, x: BTreeNode, key: Any) -> bool:
+        """
+        Insert into the subtree rooted at x, which is not full.
+        Returns False if the key is already present.
+        """
+        while True:
+            i = bisect.bisect_left(x.keys, key)
+            if i < len(x.keys) and x.keys[i] == key:
+                return False
+            if x.is_leaf():
+                x.keys.insert(i, key)
+                return True
+            if len(x.children[i].keys) == 2 * self._t - 1:
+                self._split_child(x, i)
+                if x.keys[i] == key:
+                    return False
+                if x.keys[i] < key:
+                    i += 1
+            x = x.children[i]
+
+    def _delete(self: T, x: BTreeNode, key: Any) -> None:
+        """
+        Delete a key which is present in the subtree rooted at x. Every
+        node descended into is first given at least t keys, so a key can
+        always be removed from a leaf without underflow.
+        """
+        t = self._t
+        while True:
+            i = bisect.bisect_left(x.keys, key)
+            if i < len(x.keys) and x.keys[i] == key:
+                if x.is_leaf():
+                    del x.keys[i]
+                    return
+                y = x.children[i]
+                z = x.children[i + 1]
+                if len(y.keys) >= t:
+                    key = self._max_key(y)
+                    x.keys[i] = key
+                    x = y
+                elif len(z.keys) >= t:
+                    key = self._min_key(z)
+                    x.keys[i] = key
+                    x = z
+                else:
+                    self._merge(x, i)
+                    x = y
+                continue
+            child = x.children[i]
+            if len(child.keys) == t - 1:
+                if i > 0 and len(x.children[i - 1].keys) >= t:
+                    self._borrow_left(x, i)
+                elif (i < len(x.keys)
+                      and len(x.children[i + 1].keys) >= t):
+                    self._borrow_right(x, i)
+                else:
+                    if i == len(x.keys):
+                        i -= 1
+                    self._merge(x, i)
+                child = x.children[i]
+            x = child
+
+    def _merge(self: T, x: BTreeNode, i: int) -> None:
+        """
+        Merge child i + 1 of x and the key between them into child i.
+        """
+        y = x.children[i]
+        z = x.children.pop(i + 1)
+        y.keys.append(x.keys.pop(i))
+        y.keys.extend(z.keys)
+        y.children.extend(z.children)
+
+    def _borrow_left(self: T, x: BTreeNode, i: int) -> None:
+        child = x.children[i]
+        left = x.children[i - 1]
+        child.keys.insert(0, x.keys[i - 1])
+        x.keys[i - 1] = left.keys.pop()
+        if not left.is_leaf():
+            child.children.insert(0, left.children.pop())
+
+    def _borrow_right(self: T, x: BTreeNode, i: int) -> None:
+        child = x.children[i]
+        right = x.children[i + 1]
+        child.keys.append(x.keys[i])
+        x.keys[i] = right.keys.pop(0)
+        if not right.is_leaf():
+            child.children.append(right.children.pop(0))
+
+    def _min_key(self: T, node: BTreeNode) -> Any:
+        while not node.is_leaf():
+            node = node.children[0]
+        return node.keys[0]
+
+    def _max_key(self: T, node: BTreeNode) -> Any:
+        while not node.is_leaf():
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def _iter_forward(self: T, lo: Any, hi: Any,
+                      inclusive: tuple[bool, bool]) -> Iterator:
+        # Each entry is a node and the index of its next key to yield.
+        stack = []
+        node = self.root
+        while True:
+            if lo is None:
+                i = 0
+            elif inclusive[0]:
+                i = bisect.bisect_left(node.keys, lo)
+            else:
+                i = bisect.bisect_right(node.keys, lo)
+            stack.append((node, i))
+            if node.is_leaf():
+                break
+            node = node.children[i]
+        while stack:
+            node, i = stack.pop()
+            if i == len(node.keys):
+                continue
+            key = node.keys[i]
+            if hi is not None and (hi < key or
+                                   (not inclusive[1] and key == hi)):
+                return
+            yield key
+            stack.append((node, i + 1))
+            if not node.is_leaf():
+                child = node.children[i + 1]
+                while True:
+                    stack.append((child, 0))
+                    if child.is_leaf():
+                        break
+                    child = child.children[0]
+
+    def _iter_reverse(self: T, lo: Any, hi: Any,
+                      inclusive: tuple[bool, bool]) -> Iterator:
+        # Each entry is a node and one past the index of its next key.
+        stack = []
+        node = self.root
+        while True:
+            if hi is None:
+                i = len(node.keys)
+            elif inclusive[1]:
+                i = bisect.bisect_right(node.keys, hi)
+            else:
+                i = bisect.bisect_left(node.keys, hi)
+            stack.append((node, i))
+            if node.is_leaf():
+                break
+            node = node.children[i]
+        while stack:
+            node, i = stack.pop()
+            if i == 0:
+                continue
+            key = node.keys[i - 1]
+            if lo is not None and (key < lo or
+                                   (not inclusive[0] and key == lo)):
+                return
+            yield key
+            stack.append((node, i - 1))
+            if not node.is_leaf():
+                child = node.children[i - 1]
+                while True:
+                    stack.append((child, len(child.keys)))
+                    if child.is_leaf():
+                        break
+                    child = child.children[-1]
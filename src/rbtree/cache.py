@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Any, Optional, TypeVar
+from rbtree.node_base import NodeBase
+
+
+T = TypeVar('T', bound='LookupCache')
+
+
+class LookupCache():
+    """
+    A bounded least-recently-used map from keys to nodes.
+
+    Misses are cached as NIL, so every insert or delete must invalidate
+    the affected key.
+    """
+
+    def __init__(self: T, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("Cache capacity must be positive")
+        self.capacity = capacity
+        self._entries: OrderedDict[Any, NodeBase] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self: T) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self: T) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self: T, key: Any) -> Optional[NodeBase]:
+        """
+        The cached node for key, or None if the key is not cached.
+        Raises TypeError if the key is not hashable.
+        """
+        node = self._entries.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return node
+
+    def put(self: T, key: Any, node: NodeBase) -> None:
+        self._entries[key] = node
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self: T, key: Any) -> None:
+        try:
+            self._entries.pop(key, None)
+        except TypeError:
+            pass
+
+    def clear(self: T) -> None:
+        self._entries.clear()
+
+    def reset_stats(self: T) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self: T) -> dict:
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import TypeVar
+from rbtree.node import Node
+
+T = TypeVar('T', bound='CfbNameNode')
+
+
+@lru_cache(maxsize=1 << 17)
+def cfb_sort_key(name: str) -> bytes:
+    """
+    A bytes key which orders directory entry names as MS-CFB does: by
+    length in UTF-16 code units, then by the uppercased UTF-16 code units.
+
+    The length is packed big-endian in front of the big-endian UTF-16
+    name, so plain bytes comparison gives the CFB order. Keys are cached,
+    so equal names share one key object.
+    """
+    encoded = name.encode("utf-16-be")
+    if name.isascii():
+        upper = name.upper()
+    else:
+        # Only characters with a single uppercase character are mapped.
+        upper = "".join(c.upper() if len(c.upper()) == 1 else c
+                        for c in name)
+    return (len(encoded) // 2).to_bytes(2, "big") + upper.encode("utf-16-be")
+
+
+class CfbNameNode(Node):
+    """
+    A node for MS-CFB directory entries. The CFB sort key is computed once
+    and used as the node key, so comparisons during insert and search are
+    native bytes comparisons.
+
+    To search by name, search for cfb_sort_key(name).
+    """
+
+    def __init__(self: T, name: str) -> None:
+        super().__init__(cfb_sort_key(name))
+        self.name = name
+
+    def __repr__(self: T) -> str:
+        return "Name: " + self.name
+
+    def __str__(self: T) -> str:
+        return self.name
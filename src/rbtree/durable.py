@@ -0,0 +1,221 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from enum import Enum
+from typing import Any, BinaryIO, Iterator, Optional, TypeVar
+from rbtree.node_base import NodeBase
+from rbtree.rbtree import RedBlackTree
+
+
+class Durability(Enum):
+    # Records reach the OS at each group commit, but are never fsynced.
+    NONE = 0
+    # Records are fsynced together once a group is full or has waited.
+    GROUP = 1
+    # Every record is fsynced before the operation returns.
+    SYNC = 2
+
+
+T = TypeVar('T', bound='DurableRedBlackTree')
+
+# Each log record is its length and CRC-32, then a pickled
+# (sequence number, operation, key).
+_HEADER = struct.Struct(">II")
+_INSERT = "i"
+_DELETE = "d"
+
+
+class DurableRedBlackTree():
+    """
+    A RedBlackTree which survives restarts.
+
+    Every insert and delete is appended to a write-ahead log in directory.
+    Unless durability is SYNC, records are written in groups, once
+    group_size records are pending or the oldest has waited group_delay
+    seconds, so at most group_delay seconds of changes can be lost.
+    After checkpoint_interval operations, the whole tree is written to a
+    snapshot and the log is emptied. On start up the snapshot is loaded
+    and only the log records after it are replayed. Keys must be
+    picklable.
+
+    The tree itself is available as the tree attribute for reading.
+    Changing it directly bypasses the log.
+    """
+
+    def __init__(self: T, directory: str,
+                 durability: Durability = Durability.GROUP,
+                 group_size: int = 64,
+                 group_delay: float = 0.01,
+                 checkpoint_interval: int = 100000,
+                 **options: Any) -> None:
+        self.directory = directory
+        self.durability = durability
+        self.group_size = group_size
+        self.group_delay = group_delay
+        self.checkpoint_interval = checkpoint_interval
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, "snapshot.pickle")
+        self._log_path = os.path.join(directory, "wal.log")
+
+        self.tree = RedBlackTree(**options)
+        self._sequence = 0
+        self._checkpoint_sequence = 0
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._pending_since = 0.0
+        # Writes out a pending group once it has waited group_delay.
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._recover()
+        self._log: BinaryIO = open(self._log_path, "ab")
+
+    # Dunder Methods
+
+    def __len__(self: T) -> int:
+        return len(self.tree)
+
+    def __iter__(self: T) -> Iterator:
+        return iter(self.tree)
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self: T, *args: Any) -> None:
+        self.close()
+
+    # Public Methods
+
+    def search(self: T, key: Any) -> NodeBase:
+        return self.tree.search(key)
+
+    def insert(self: T, key: Any) -> None:
+        self.tree.insert(key)
+        self._append(_INSERT, key)
+
+    def delete(self: T, key: Any) -> None:
+        self.tree.delete(key)
+        self._append(_DELETE, key)
+
+    def sync(self: T) -> None:
+        """
+        Write out any pending records, and fsync unless durability is NONE.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                self._log.write(self._pending)
+                self._pending.clear()
+                self._pending_count = 0
+            self._log.flush()
+            if self.durability is not Durability.NONE:
+                os.fsync(self._log.fileno())
+
+    def checkpoint(self: T) -> None:
+        """
+        Write a snapshot of the whole tree, then empty the log.
+        """
+        with self._lock:
+            self._checkpoint()
+
+    def close(self: T) -> None:
+        with self._lock:
+            if not self._log.closed:
+                self.sync()
+                self._log.close()
+
+    # Protected Methods
+
+    def _checkpoint(self: T) -> None:
+        self.sync()
+        temp_path = self._snapshot_path + ".tmp"
+        with open(temp_path, "wb") as snapshot:
+            pickle.dump((self._sequence, self.tree), snapshot,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, self._snapshot_path)
+        self._fsync_directory()
+        # Records up to the snapshot are skipped on replay, so a crash
+        # before the log is emptied is harmless.
+        self._log.close()
+        self._log = open(self._log_path, "wb")
+        os.fsync(self._log.fileno())
+        self._checkpoint_sequence = self._sequence
+
+    def _append(self: T, op: str, key: Any) -> None:
+        with self._lock:
+            self._sequence += 1
+            data = pickle.dumps((self._sequence, op, key),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending += _HEADER.pack(len(data), zlib.crc32(data))
+            self._pending += data
+            self._pending_count += 1
+
+            waited = time.monotonic() - self._pending_since
+            if (self.durability is Durability.SYNC
+                    or self._pending_count >= self.group_size
+                    or waited >= self.group_delay):
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.group_delay - waited,
+                                              self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+            since_checkpoint = self._sequence - self._checkpoint_sequence
+            if since_checkpoint >= self.checkpoint_interval:
+                self._checkpoint()
+
+    def _flush_pending(self: T) -> None:
+        """
+        Called by the timer once a pending group has waited group_delay.
+        """
+        with self._lock:
+            if self._pending and not self._log.closed:
+                self.sync()
+
+    def _recover(self: T) -> None:
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "rb") as snapshot:
+                self._sequence, self.tree = pickle.load(snapshot)
+            self._checkpoint_sequence = self._sequence
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, "rb") as log:
+            data = log.read()
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, crc = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            record = data[start:start + length]
+            if len(record) < length or zlib.crc32(record) != crc:
+                # A torn write at the end of the log.
+                break
+            sequence, op, key = pickle.loads(record)
+            if sequence > self._sequence:
+                if op == _INSERT:
+                    self.tree.insert(key)
+                else:
+                    self.tree.delete(key)
+                self._sequence = sequence
+            offset = start + length
+        if offset < len(data):
+            with open(self._log_path, "r+b") as log:
+                log.truncate(offset)
+
+    def _fsync_directory(self: T) -> None:
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened on some platforms.
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,170 @@
+import bisect
+import copy
+from typing import Any, Iterable, Iterator, TypeVar, TYPE_CHECKING
+from rbtree.node import Node, PooledNode
+from rbtree.node_base import NodeBase
+
+if TYPE_CHECKING:
+    from rbtree.rbtree import RedBlackTree
+
+
+T = TypeVar('T', bound='FrozenTree')
+
+
+def _eytzinger(keys: tuple) -> tuple:
+    """
+    Lay out sorted keys in breadth-first order of the implicit complete
+    binary search tree, where the children of position k are 2k and
+    2k + 1. Position 0 is unused.
+    """
+    n = len(keys)
+    layout: list = [None] * (n + 1)
+    i = 0
+    stack: list[int] = []
+    k = 1
+    # An in-order walk of the implicit tree, filling it in sorted order.
+    while stack or k <= n:
+        while k <= n:
+            stack.append(k)
+            k *= 2
+        k = stack.pop()
+        layout[k] = keys[i]
+        i += 1
+        k = 2 * k + 1
+    return tuple(layout)
+
+
+class FrozenTree():
+    """
+    An immutable sorted set, with no per-node objects.
+
+    Keys are stored twice, in sorted order for bisect-based range queries
+    and in Eytzinger order for searches. Since nothing can change, a
+    FrozenTree can be shared between threads without locks.
+    """
+    __slots__ = ("_sorted", "_layout")
+
+    _sorted: tuple
+    _layout: tuple
+
+    def __init__(self: T, keys: Iterable) -> None:
+        """
+        keys must already be sorted and unique.
+        """
+        ordered = tuple(keys)
+        object.__setattr__(self, "_sorted", ordered)
+        object.__setattr__(self, "_layout", _eytzinger(ordered))
+
+    # Dunder Methods
+
+    def __setattr__(self: T, name: str, value: Any) -> None:
+        raise AttributeError("FrozenTree is immutable")
+
+    def __len__(self: T) -> int:
+        return len(self._sorted)
+
+    def __iter__(self: T) -> Iterator:
+        return iter(self._sorted)
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self.search(key) is not None
+
+    def __reduce__(self: T) -> tuple:
+        return (FrozenTree, (self._sorted,))
+
+    # Public Methods
+
+    def search(self: T, key: Any) -> Any:
+        """
+        The stored key equal to key, or None.
+        """
+        k = self._lower_bound(key)
+        if k and self._layout[k] == key:
+            return self._layout[k]
+        return None
+
+    def ceiling(self: T, key: Any) -> Any:
+        """
+        The smallest key greater than or equal to key, or None.
+        """
+        k = self._lower_bound(key)
+        return self._layout[k] if k else None
+
+    def floor(self: T, key: Any) -> Any:
+        """
+        The largest key less than or equal to key, or None.
+        """
+        i = bisect.bisect_right(self._sorted, key)
+        return self._sorted[i - 1] if i else None
+
+    def minimum(self: T) -> Any:
+        return self._sorted[0] if self._sorted else None
+
+    def maximum(self: T) -> Any:
+        return self._sorted[-1] if self._sorted else None
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator:
+        keys = self._sorted
+        if lo is None:
+            start = 0
+        elif inclusive[0]:
+            start = bisect.bisect_left(keys, lo)
+        else:
+            start = bisect.bisect_right(keys, lo)
+        if hi is None:
+            stop = len(keys)
+        elif inclusive[1]:
+            stop = bisect.bisect_right(keys, hi)
+        else:
+            stop = bisect.bisect_left(keys, hi)
+        indices = range(start, stop)
+        return (keys[i] for i in (reversed(indices) if reverse else indices))
+
+    def thaw(self: T, **options: Any) -> 'RedBlackTree':
+        """
+        A new mutable RedBlackTree of the same keys, built in O(n). Any
+        options are passed to the RedBlackTree constructor.
+        """
+        from rbtree.rbtree import RedBlackTree
+        tree = RedBlackTree(**options)
+        nodes: list[NodeBase] = []
+        for key in self._sorted:
+            # Custom nodes are stored as themselves.
+            if isinstance(key, NodeBase):
+                nodes.append(copy.copy(key))
+            else:
+                nodes.append(Node(key))
+        tree._rebuild(nodes)
+        return tree
+
+    # Protected Methods
+
+    def _lower_bound(self: T, key: Any) -> int:
+        """
+        The Eytzinger position of the first key >= key, or 0 if none.
+        """
+        layout = self._layout
+        n = len(layout) - 1
+        k = 1
+        while k <= n:
+            k = 2 * k + (layout[k] < key)
+        # Undo the right turns taken after the last left turn.
+        k >>= ((~k) & (k + 1)).bit_length()
+        return k
+
+
+def freeze(nodes: Iterable[NodeBase]) -> FrozenTree:
+    """
+    Build a FrozenTree from nodes in order. The keys of plain Nodes are
+    stored. Custom nodes may order themselves differently from their keys,
+    so detached copies of them are stored instead.
+    """
+    keys: list = []
+    for node in nodes:
+        if type(node) is Node or type(node) is PooledNode:
+            keys.append(node.key)
+        else:
+            keys.append(copy.copy(node))
+    return FrozenTree(keys)
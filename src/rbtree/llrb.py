@@ -0,0 +1,338 @@
+from typing import Any, Iterator, Optional, TypeVar
+
+
+N = TypeVar('N', bound='LLRBNode')
+T = TypeVar('T', bound='LeftLeaningRedBlackTree')
+
+
+class LLRBNode():
+    """
+    A node with no parent link, and no per-instance dictionary.
+    Empty children are None.
+    """
+    __slots__ = ("key", "left", "right", "red")
+
+    def __init__(self: N, key: Any) -> None:
+        self.key = key
+        self.left: Optional[LLRBNode] = None
+        self.right: Optional[LLRBNode] = None
+        self.red = True
+
+    def __repr__(self: N) -> str:
+        return "Key: " + str(self.key)
+
+    def __str__(self: N) -> str:
+        return str(self.key)
+
+    @property
+    def color(self: N) -> str:
+        return "red" if self.red else "black"
+
+    def is_red(self: N) -> bool:
+        return self.red
+
+    def is_black(self: N) -> bool:
+        return not self.red
+
+
+def _is_red(node: Optional[LLRBNode]) -> bool:
+    return node is not None and node.red
+
+
+class LeftLeaningRedBlackTree():
+    """
+    A left-leaning red-black tree (Sedgewick), which needs no parent
+    links. Insert and delete work top-down with recursion on the way back
+    up, and traversals use an explicit stack.
+
+    Keys are compared directly, so they must support < and ==.
+    """
+
+    def __init__(self: T) -> None:
+        self.root: Optional[LLRBNode] = None
+        self.size = 0
+
+    # Dunder Methods
+
+    def __len__(self: T) -> int:
+        return self.size
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self.search(key) is not None
+
+    def __iter__(self: T) -> Iterator:
+        return (node.key for node in self.irange())
+
+    # Public Methods
+
+    def search(self: T, key: Any) -> Optional[LLRBNode]:
+        """
+        Find the node with the given key, or None.
+        """
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def minimum(self: T) -> Optional[LLRBNode]:
+        node = self.root
+        while node is not None and node.left is not None:
+            node = node.left
+        return node
+
+    def maximum(self: T) -> Optional[LLRBNode]:
+        node = self.root
+        while node is not None and node.right is not None:
+            node = node.right
+        return node
+
+    def successor(self: T, key: Any) -> Optional[LLRBNode]:
+        """
+        The node with the smallest key greater than key, or None.
+        """
+        node = self.root
+        best = None
+        while node is not None:
+            if key < node.key:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def predecessor(self: T, key: Any) -> Optional[LLRBNode]:
+        """
+        The node with the largest key less than key, or None.
+        """
+        node = self.root
+        best = None
+        while node is not None:
+            if node.key < key:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def insert(self: T, key: Any) -> None:
+        self.root = self._insert(self.root, key)
+        self.root.red = False
+
+    def delete(self: T, key: Any) -> None:
+        if self.root is None or self.search(key) is None:
+            return
+        if not _is_red(self.root.left) and not _is_red(self.root.right):
+            self.root.red = True
+        self.root = self._delete(self.root, key)
+        if self.root is not None:
+            self.root.red = False
+        self.size -= 1
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[LLRBNode]:
+        """
+        Lazily iterate over the nodes with keys between lo and hi.
+        """
+        def below(key: Any) -> bool:
+            if lo is None:
+                return False
+            return key < lo or (not inclusive[0] and key == lo)
+
+        def above(key: Any) -> bool:
+            if hi is None:
+                return False
+            return hi < key or (not inclusive[1] and key == hi)
+
+        stack = []
+        node = self.root
+        while node is not None:
+            if not reverse and below(node.key):
+                node = node.right
+            elif reverse and above(node.key):
+                node = node.left
+            else:
+                stack.append(node)
+                node = node.right if reverse else node.left
+        past_end = below if reverse else above
+        while stack:
+            node = stack.pop()
+            if past_end(node.key):
+                return
+            yield node
+            child = node.left if reverse else node.right
+            while child is not None:
+                stack.append(child)
+                child = child.right if reverse else child.left
+
+    def inorder(self: T) -> list:
+        return list(self.irange())
+
+    def preorder(self: T) -> list:
+        output = []
+        stack = [] if self.root is None else [self.root]
+        while stack:
+            node = stack.pop()
+            output.append(node)
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+        return output
+
+    def postorder(self: T) -> list:
+        # A reversed root-right-left preorder.
+        output = []
+        stack = [] if self.root is None else [self.root]
+        while stack:
+            node = stack.pop()
+            output.append(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        output.reverse()
+        return output
+
+    def is_valid(self: T) -> bool:
+        if self.root is None:
+            return True
+        if self.root.red:
+            return False
+        valid, _ = LeftLeaningRedBlackTree.validate(self.root, None, None)
+        return valid
+
+    @staticmethod
+    def validate(node: Optional[LLRBNode], min_key: Any,
+                 max_key: Any) -> tuple[bool, int]:
+        """
+        Check the order, no right-leaning red links, no two reds in a row
+        and equal black heights. Returns (is_valid, black_height).
+        """
+        if node is None:
+            return True, 0
+        if min_key is not None and not min_key < node.key:
+            return False, -1
+        if max_key is not None and not node.key < max_key:
+            return False, -1
+        if _is_red(node.right):
+            return False, -1
+        if node.red and _is_red(node.left):
+            return False, -1
+        left_valid, left_bh = LeftLeaningRedBlackTree.validate(
+            node.left, min_key, node.key
+        )
+        right_valid, right_bh = LeftLeaningRedBlackTree.validate(
+            node.right, node.key, max_key
+        )
+        if not left_valid or not right_valid or left_bh != right_bh:
+            return False, -1
+        return True, left_bh + (0 if node.red else 1)
+
+    # Protected Methods
+
+    def _insert(self: T, h: Optional[LLRBNode], key: Any) -> LLRBNode:
+        if h is None:
+            self.size += 1
+            return LLRBNode(key)
+        if key < h.key:
+            h.left = self._insert(h.left, key)
+        elif h.key < key:
+            h.right = self._insert(h.right, key)
+        else:
+            # Silently ignore duplicates.
+            return h
+        return self._balance(h)
+
+    def _delete(self: T, h: LLRBNode, key: Any) -> Optional[LLRBNode]:
+        """
+        Remove key, which must be present, from the subtree rooted at h.
+        """
+        if key < h.key:
+            assert h.left is not None
+            if not _is_red(h.left) and not _is_red(h.left.left):
+                h = self._move_red_left(h)
+            assert h.left is not None
+            h.left = self._delete(h.left, key)
+        else:
+            if _is_red(h.left):
+                h = self._rotate_right(h)
+            if key == h.key and h.right is None:
+                return None
+            assert h.right is not None
+            if not _is_red(h.right) and not _is_red(h.right.left):
+                h = self._move_red_right(h)
+            assert h.right is not None
+            if key == h.key:
+                successor = h.right
+                while successor.left is not None:
+                    successor = successor.left
+                h.key = successor.key
+                h.right = self._delete_min(h.right)
+            else:
+                h.right = self._delete(h.right, key)
+        return self._balance(h)
+
+    def _delete_min(self: T, h: LLRBNode) -> Optional[LLRBNode]:
+        if h.left is None:
+            return None
+        if not _is_red(h.left) and not _is_red(h.left.left):
+            h = self._move_red_left(h)
+        assert h.left is not None
+        h.left = self._delete_min(h.left)
+        return self._balance(h)
+
+    def _rotate_left(self: T, h: LLRBNode) -> LLRBNode:
+        x = h.right
+        assert x is not None
+        h.right = x.left
+        x.left = h
+        x.red = h.red
+        h.red = True
+        return x
+
+    def _rotate_right(self: T, h: LLRBNode) -> LLRBNode:
+        x = h.left
+        assert x is not None
+        h.left = x.right
+        x.right = h
+        x.red = h.red
+        h.red = True
+        return x
+
+    def _flip_colors(self: T, h: LLRBNode) -> None:
+        assert h.left is not None and h.right is not None
+        h.red = not h.red
+        h.left.red = not h.left.red
+        h.right.red = not h.right.red
+
+    def _move_red_left(self: T, h: LLRBNode) -> LLRBNode:
+        self._flip_colors(h)
+        assert h.right is not None
+        if _is_red(h.right.left):
+            h.right = self._rotate_right(h.right)
+            h = self._rotate_left(h)
+            self._flip_colors(h)
+        return h
+
+    def _move_red_right(self: T, h: LLRBNode) -> LLRBNode:
+        self._flip_colors(h)
+        assert h.left is not None
+        if _is_red(h.left.left):
+            h = self._rotate_right(h)
+            self._flip_colors(h)
+        return h
+
+    def _balance(self: T, h: LLRBNode) -> LLRBNode:
+        if _is_red(h.right) and not _is_red(h.left):
+            h = self._rotate_left(h)
+        if h.left is not None and h.left.red and _is_red(h.left.left):
+            h = self._rotate_right(h)
+        if _is_red(h.left) and _is_red(h.right):
+            self._flip_colors(h)
+        return h
@@ -0,0 +1,110 @@
+import sys
+from typing import Any, TYPE_CHECKING
+from rbtree.node_base import NodeBase
+
+if TYPE_CHECKING:
+    from rbtree.rbtree import RedBlackTree
+
+
+# Links and bookkeeping attributes, which are not part of the node's data.
+_STRUCTURE = frozenset(("parent", "left", "right", "_red", "_deleted",
+                        "aggregate"))
+
+
+def deep_sizeof(obj: Any, seen: set) -> int:
+    """
+    The size of obj and everything reachable from it through containers
+    and instance dictionaries, skipping anything already in seen and any
+    tree nodes.
+    """
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, NodeBase):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(item.__dict__)
+    return total
+
+
+def node_memory_usage(node: NodeBase) -> dict:
+    """
+    A breakdown, in bytes, of the memory held by a single node: the object
+    itself, its instance dictionary, and each attribute value.
+    """
+    dict_size = 0
+    attributes: dict[str, int] = {}
+    if hasattr(node, "__dict__"):
+        dict_size = sys.getsizeof(node.__dict__)
+        for name, value in node.__dict__.items():
+            if not isinstance(value, NodeBase):
+                attributes[name] = sys.getsizeof(value)
+    return {
+        "object": sys.getsizeof(node),
+        "__dict__": dict_size,
+        "attributes": attributes,
+    }
+
+
+def tree_memory_usage(tree: 'RedBlackTree', deep: bool = False) -> dict:
+    """
+    The memory, in bytes, held by a tree.
+
+    nodes counts the node objects and their instance dictionaries,
+    including tombstones. keys counts the data held by the nodes, which is
+    only measured if deep, since it is usually shared with the caller.
+    auxiliary counts the tree object, its caches, hash index and node pool.
+    per_node is the breakdown of a single node, the root, showing the node
+    layout in use.
+    """
+    seen: set = set()
+    nodes = 0
+    keys = 0
+    stack = [] if tree.root.is_null() else [tree.root]
+    while stack:
+        node = stack.pop()
+        nodes += sys.getsizeof(node)
+        if hasattr(node, "__dict__"):
+            nodes += sys.getsizeof(node.__dict__)
+            if deep:
+                for name, value in node.__dict__.items():
+                    if name not in _STRUCTURE:
+                        keys += deep_sizeof(value, seen)
+        if not node.left.is_null():
+            stack.append(node.left)
+        if not node.right.is_null():
+            stack.append(node.right)
+
+    auxiliary = sys.getsizeof(tree) + sys.getsizeof(tree.__dict__)
+    cache = tree.cache
+    if cache is not None:
+        auxiliary += sys.getsizeof(cache) + sys.getsizeof(cache._entries)
+        if deep:
+            for key in cache._entries:
+                auxiliary += deep_sizeof(key, seen)
+    auxiliary += sys.getsizeof(tree._subscribers)
+    auxiliary += sys.getsizeof(tree._pool)
+    if tree._index is not None:
+        auxiliary += sys.getsizeof(tree._index)
+    for node in tree._pool:
+        auxiliary += sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+
+    per_node = None
+    if not tree.root.is_null():
+        per_node = node_memory_usage(tree.root)
+    return {
+        "nodes": nodes,
+        "keys": keys,
+        "auxiliary": auxiliary,
+        "total": nodes + keys + auxiliary,
+        "count": len(tree) + tree.tombstones,
+        "per_node": per_node,
+    }
@@ -0,0 +1,24 @@
+import heapq
+from typing import Any, Iterator
+
+
+def merge(*trees: Any, reverse: bool = False,
+          dedupe: bool = False) -> Iterator:
+    """
+    Lazily merge the in-order streams of several trees into one sorted
+    stream. Each tree is walked with its own irange, so only one root to
+    leaf path per tree is held at a time. If dedupe, only the first of
+    equal items is yielded, taking trees in the order given.
+    """
+    merged = heapq.merge(*(tree.irange(reverse=reverse) for tree in trees),
+                         reverse=reverse)
+    if not dedupe:
+        yield from merged
+        return
+    previous: Any = None
+    first = True
+    for item in merged:
+        if first or not item == previous:
+            yield item
+            previous = item
+            first = False
@@ -31,3 +31,10 @@ class Node(NodeBase):
     @property
     def key(self: T) -> Any:
         return self._key
+
+
+class PooledNode(Node):
+    """
+    A Node created by a tree with a node pool. Once deleted, the tree may
+    reuse it for another key.
+    """
@@ -7,6 +7,10 @@ T = TypeVar('T', bound='NodeBase')
 
 class NodeBase(ABC):
     NIL: 'NullNode'
+    # Subtree aggregate, only maintained by an augmented tree.
+    aggregate: Any = None
+    # Set on nodes deleted from a tree in lazy delete mode.
+    _deleted = False
 
     def __init__(self: T) -> None:
         self.parent: NodeBase = NodeBase.NIL
@@ -20,6 +24,21 @@ class NodeBase(ABC):
     def __str__(self: T) -> str:
         return ""
 
+    def __getstate__(self: T) -> dict:
+        """
+        Copy or pickle the node without its links to the rest of the tree.
+        """
+        state = self.__dict__.copy()
+        for link in ("parent", "left", "right"):
+            state.pop(link, None)
+        return state
+
+    def __setstate__(self: T, state: dict) -> None:
+        self.__dict__.update(state)
+        self.parent = NodeBase.NIL
+        self.left = NodeBase.NIL
+        self.right = NodeBase.NIL
+
     @abstractmethod
     def __lt__(self: T, other: Any) -> bool: ...
 
@@ -45,6 +64,9 @@ class NodeBase(ABC):
     def is_null(self: T) -> bool:
         return False
 
+    def is_deleted(self: T) -> bool:
+        return self._deleted
+
     def depth(self: T) -> int:
         return 0 if self.parent.is_null() else self.parent.depth() + 1
 
@@ -88,8 +110,16 @@ class NullNode(NodeBase):
     def __ne__(self: T, other: Any) -> bool: return not other.is_null()
     def __lt__(self: T, other: Any) -> bool: return False
 
+    def __reduce__(self: N) -> tuple:
+        # There is only ever one null node, even across processes.
+        return (_nil, ())
+
     def is_null(self: N) -> bool: return True
     def depth(self: N) -> int: return -1
 
 
+def _nil() -> NullNode:
+    return NodeBase.NIL
+
+
 NodeBase.NIL = NullNode()
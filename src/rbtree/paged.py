@@ -0,0 +1,611 @@
+import os
+import struct
+from collections import OrderedDict
+from typing import Any, BinaryIO, Iterator, Optional, TypeVar
+
+
+P = TypeVar('P', bound='BufferPool')
+T = TypeVar('T', bound='PagedRedBlackTree')
+
+# Page 0 holds the header: a magic number, the page size, the key format,
+# then the root, size, head of the free list and next unused node id.
+_HEADER = struct.Struct("<4sI16sqqqq")
+_MAGIC = b"RBTP"
+_LINK = struct.Struct("<q")
+
+# Each node record is its parent, left and right ids, its color and then
+# its key. Free records are chained through their parent field.
+_PARENT = 0
+_LEFT = 8
+_RIGHT = 16
+_RED = 24
+_KEY = 25
+
+# Node ids are page * slots per page + slot. Data starts on page 1, so id
+# 0 is never a real node and is used as NIL.
+NIL = 0
+
+
+class BufferPool():
+    """
+    A least-recently-used cache of fixed-size pages of a file. Changed
+    pages are written back when they are evicted or flushed.
+    """
+
+    def __init__(self: P, file: BinaryIO, page_size: int,
+                 capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("Pool capacity must be positive")
+        self.file = file
+        self.page_size = page_size
+        self.capacity = capacity
+        self._pages: OrderedDict[int, bytearray] = OrderedDict()
+        self._dirty: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __len__(self: P) -> int:
+        return len(self._pages)
+
+    @property
+    def hit_rate(self: P) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def page(self: P, number: int, dirty: bool = False) -> bytearray:
+        """
+        The contents of a page, read from the file if it is not cached.
+        Pages past the end of the file are empty. If dirty, the page will
+        be written back.
+        """
+        data = self._pages.get(number)
+        if data is None:
+            self.misses += 1
+            self.file.seek(number * self.page_size)
+            data = bytearray(self.file.read(self.page_size))
+            data.extend(bytes(self.page_size - len(data)))
+            self._pages[number] = data
+            while len(self._pages) > self.capacity:
+                old, contents = self._pages.popitem(last=False)
+                if old in self._dirty:
+                    self._write(old, contents)
+        else:
+            self.hits += 1
+            self._pages.move_to_end(number)
+        if dirty:
+            self._dirty.add(number)
+        return data
+
+    def flush(self: P) -> None:
+        """
+        Write back every changed page.
+        """
+        for number in sorted(self._dirty):
+            self._write(number, self._pages[number])
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def reset_stats(self: P) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def stats(self: P) -> dict:
+        return {
+            "size": len(self._pages),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _write(self: P, number: int, contents: bytearray) -> None:
+        self.file.seek(number * self.page_size)
+        self.file.write(contents)
+        self._dirty.discard(number)
+        self.writes += 1
+
+
+class PagedRedBlackTree():
+    """
+    A red-black tree kept in fixed-size pages of a file, for indexes which
+    do not fit in memory. Only the pages in the buffer pool are held in
+    memory.
+
+    Keys are fixed size, packed with the struct format key_format: "q"
+    for integers, "d" for floats or, for example, "16s" for byte strings
+    of up to 16 bytes. Byte strings are padded with zero bytes, so they
+    may not end in one. Nodes are referred to by id, and the insert and delete
+    fix-ups are those of RedBlackTree.
+
+    Changes reach the file when pages are evicted and on flush or close.
+    """
+
+    def __init__(self: T, path: str, key_format: str = "q",
+                 page_size: int = 4096, pool_size: int = 64) -> None:
+        self.path = path
+        self._key = struct.Struct("<" + key_format)
+        self._record_size = _KEY + self._key.size
+        self._slots = page_size // self._record_size
+        if self._slots < 1:
+            raise ValueError("Page size is too small for one node")
+        self._is_bytes = key_format.endswith("s")
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file: BinaryIO = open(path, "r+b" if exists else "w+b")
+        self.pool = BufferPool(self._file, page_size, pool_size)
+        if exists:
+            (magic, stored_size, stored_format, self._root, self.size,
+             self._free, self._next_id) = _HEADER.unpack_from(
+                self.pool.page(0))
+            if magic != _MAGIC:
+                self._file.close()
+                raise ValueError(path + " is not a paged tree")
+            if (stored_size != page_size
+                    or stored_format.rstrip(b"\0") != key_format.encode()):
+                self._file.close()
+                raise ValueError(
+                    path + " was created with a different page size or "
+                    "key format"
+                )
+        else:
+            self._root = NIL
+            self.size = 0
+            self._free = NIL
+            self._next_id = self._slots
+        self._page_size = page_size
+        self._key_format = key_format
+
+    # Dunder Methods
+
+    def __len__(self: T) -> int:
+        return self.size
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self._find(key) != NIL
+
+    def __iter__(self: T) -> Iterator:
+        return self.irange()
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self: T, *args: Any) -> None:
+        self.close()
+
+    # Public Methods
+
+    def search(self: T, key: Any) -> Any:
+        """
+        The stored key equal to key, or None.
+        """
+        n = self._find(key)
+        return None if n == NIL else self._get_key(n)
+
+    def minimum(self: T) -> Any:
+        n = self._leftmost(self._root)
+        return None if n == NIL else self._get_key(n)
+
+    def maximum(self: T) -> Any:
+        n = self._rightmost(self._root)
+        return None if n == NIL else self._get_key(n)
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator:
+        """
+        Lazily iterate over the keys between lo and hi.
+        """
+        def below(key: Any) -> bool:
+            if lo is None:
+                return False
+            return key < lo or (not inclusive[0] and key == lo)
+
+        def above(key: Any) -> bool:
+            if hi is None:
+                return False
+            return hi < key or (not inclusive[1] and key == hi)
+
+        # Find the first node in iteration order.
+        start = NIL
+        n = self._root
+        while n != NIL:
+            key = self._get_key(n)
+            if reverse:
+                if above(key):
+                    n = self._left(n)
+                else:
+                    start = n
+                    n = self._right(n)
+            elif below(key):
+                n = self._right(n)
+            else:
+                start = n
+                n = self._left(n)
+        past_end = below if reverse else above
+        n = start
+        while n != NIL:
+            key = self._get_key(n)
+            if past_end(key):
+                return
+            yield key
+            n = self._prev(n) if reverse else self._next(n)
+
+    def insert(self: T, key: Any) -> None:
+        self._check_key(key)
+        y = NIL
+        x = self._root
+        while x != NIL:
+            y = x
+            x_key = self._get_key(x)
+            if key == x_key:
+                return
+            x = self._left(x) if key < x_key else self._right(x)
+
+        node = self._allocate(key)
+        self._set_parent(node, y)
+        if y == NIL:
+            self._root = node
+        elif key < self._get_key(y):
+            self._set_left(y, node)
+        else:
+            self._set_right(y, node)
+        self.size += 1
+
+        if y == NIL:
+            self._set_red(node, False)
+            return
+        if self._parent(y) == NIL:
+            return
+        self._fix_insert(node)
+
+    def delete(self: T, key: Any) -> None:
+        z = self._find(key)
+        if z != NIL:
+            self._remove_node(z)
+
+    def flush(self: T) -> None:
+        """
+        Write the header and every changed page to the file.
+        """
+        _HEADER.pack_into(self.pool.page(0, dirty=True), 0, _MAGIC,
+                          self._page_size, self._key_format.encode(),
+                          self._root, self.size, self._free,
+                          self._next_id)
+        self.pool.flush()
+
+    def close(self: T) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def is_valid(self: T) -> bool:
+        """
+        Check the key order, that no red node has a red child, that the
+        root is black and that every path has the same black height.
+        """
+        if self._is_red(self._root):
+            return False
+        valid, _ = self._validate(self._root, None, None)
+        return valid
+
+    # Protected Methods
+
+    def _locate(self: T, n: int,
+                dirty: bool = False) -> tuple[bytearray, int]:
+        """
+        The page holding node n, and the offset of its record.
+        """
+        page, slot = divmod(n, self._slots)
+        return self.pool.page(page, dirty), slot * self._record_size
+
+    def _link(self: T, n: int, field: int) -> int:
+        data, offset = self._locate(n)
+        return _LINK.unpack_from(data, offset + field)[0]
+
+    def _set_link(self: T, n: int, field: int, value: int) -> None:
+        data, offset = self._locate(n, True)
+        _LINK.pack_into(data, offset + field, value)
+
+    def _parent(self: T, n: int) -> int:
+        return self._link(n, _PARENT)
+
+    def _left(self: T, n: int) -> int:
+        return self._link(n, _LEFT)
+
+    def _right(self: T, n: int) -> int:
+        return self._link(n, _RIGHT)
+
+    def _set_parent(self: T, n: int, value: int) -> None:
+        self._set_link(n, _PARENT, value)
+
+    def _set_left(self: T, n: int, value: int) -> None:
+        self._set_link(n, _LEFT, value)
+
+    def _set_right(self: T, n: int, value: int) -> None:
+        self._set_link(n, _RIGHT, value)
+
+    def _is_red(self: T, n: int) -> bool:
+        if n == NIL:
+            return False
+        data, offset = self._locate(n)
+        return bool(data[offset + _RED])
+
+    def _set_red(self: T, n: int, red: bool) -> None:
+        # NIL is always black, and has no record to write to.
+        if n == NIL:
+            return
+        data, offset = self._locate(n, True)
+        data[offset + _RED] = red
+
+    def _get_key(self: T, n: int) -> Any:
+        data, offset = self._locate(n)
+        key = self._key.unpack_from(data, offset + _KEY)[0]
+        return key.rstrip(b"\0") if self._is_bytes else key
+
+    def _check_key(self: T, key: Any) -> None:
+        """
+        Reject byte strings which would not be stored as given.
+        """
+        if not self._is_bytes:
+            return
+        if len(key) > self._key.size:
+            raise ValueError(
+                f"Key is longer than {self._key.size} bytes: {key!r}"
+            )
+        if key.endswith(b"\0"):
+            raise ValueError(f"Key ends in a zero byte: {key!r}")
+
+    def _allocate(self: T, key: Any) -> int:
+        """
+        A new red node with no children, reusing a freed record if any.
+        """
+        if self._free != NIL:
+            n = self._free
+            self._free = self._parent(n)
+        else:
+            n = self._next_id
+            self._next_id += 1
+        data, offset = self._locate(n, True)
+        _LINK.pack_into(data, offset + _LEFT, NIL)
+        _LINK.pack_into(data, offset + _RIGHT, NIL)
+        data[offset + _RED] = True
+        self._key.pack_into(data, offset + _KEY, key)
+        return n
+
+    def _find(self: T, key: Any) -> int:
+        self._check_key(key)
+        n = self._root
+        while n != NIL:
+            n_key = self._get_key(n)
+            if key == n_key:
+                return n
+            n = self._left(n) if key < n_key else self._right(n)
+        return NIL
+
+    def _leftmost(self: T, n: int) -> int:
+        if n == NIL:
+            return n
+        while self._left(n) != NIL:
+            n = self._left(n)
+        return n
+
+    def _rightmost(self: T, n: int) -> int:
+        if n == NIL:
+            return n
+        while self._right(n) != NIL:
+            n = self._right(n)
+        return n
+
+    def _next(self: T, x: int) -> int:
+        if self._right(x) != NIL:
+            return self._leftmost(self._right(x))
+        y = self._parent(x)
+        while y != NIL and x == self._right(y):
+            x = y
+            y = self._parent(y)
+        return y
+
+    def _prev(self: T, x: int) -> int:
+        if self._left(x) != NIL:
+            return self._rightmost(self._left(x))
+        y = self._parent(x)
+        while y != NIL and x == self._left(y):
+            x = y
+            y = self._parent(y)
+        return y
+
+    def _fix_insert(self: T, node: int) -> None:
+        while self._is_red(self._parent(node)):
+            np = self._parent(node)
+            ngp = self._parent(np)
+            if np == self._right(ngp):
+                u = self._left(ngp)
+                if self._is_red(u):
+                    self._set_red(u, False)
+                    self._set_red(np, False)
+                    self._set_red(ngp, True)
+                    node = ngp
+                else:
+                    if node == self._left(np):
+                        node = np
+                        self._right_rotate(node)
+                    np = self._parent(node)
+                    self._set_red(np, False)
+                    ngp = self._parent(np)
+                    self._set_red(ngp, True)
+                    self._left_rotate(ngp)
+            else:
+                u = self._right(ngp)
+                if self._is_red(u):
+                    self._set_red(u, False)
+                    self._set_red(np, False)
+                    self._set_red(ngp, True)
+                    node = ngp
+                else:
+                    if node == self._right(np):
+                        node = np
+                        self._left_rotate(node)
+                    np = self._parent(node)
+                    self._set_red(np, False)
+                    ngp = self._parent(np)
+                    self._set_red(ngp, True)
+                    self._right_rotate(ngp)
+            if node == self._root:
+                break
+        self._set_red(self._root, False)
+
+    def _remove_node(self: T, z: int) -> None:
+        y = z
+        y_original_red = self._is_red(y)
+        if self._left(z) == NIL:
+            x = self._right(z)
+            np = self._parent(z)
+            self._transplant(z, x)
+        elif self._right(z) == NIL:
+            x = self._left(z)
+            np = self._parent(z)
+            self._transplant(z, x)
+        else:
+            y = self._leftmost(self._right(z))
+            y_original_red = self._is_red(y)
+            x = self._right(y)
+            if self._parent(y) == z:
+                np = y
+            else:
+                np = self._parent(y)
+                self._transplant(y, x)
+                self._set_right(y, self._right(z))
+                self._set_parent(self._right(y), y)
+            self._transplant(z, y)
+            self._set_left(y, self._left(z))
+            self._set_parent(self._left(y), y)
+            self._set_red(y, self._is_red(z))
+        if not y_original_red:
+            self._delete_fix(x, np)
+        # Free records are chained through their parent field.
+        self._set_parent(z, self._free)
+        self._free = z
+        self.size -= 1
+
+    def _delete_fix(self: T, x: int, np: int) -> None:
+        """
+        x may be NIL, so its parent is tracked separately in np.
+        """
+        while x != self._root and not self._is_red(x):
+            if x == self._left(np):
+                s = self._right(np)
+                if self._is_red(s):
+                    self._set_red(s, False)
+                    self._set_red(np, True)
+                    self._left_rotate(np)
+                    s = self._right(np)
+                if (not self._is_red(self._left(s))
+                        and not self._is_red(self._right(s))):
+                    self._set_red(s, True)
+                    x = np
+                    np = self._parent(x)
+                else:
+                    if not self._is_red(self._right(s)):
+                        self._set_red(self._left(s), False)
+                        self._set_red(s, True)
+                        self._right_rotate(s)
+                        s = self._right(np)
+                    self._set_red(s, self._is_red(np))
+                    self._set_red(np, False)
+                    self._set_red(self._right(s), False)
+                    self._left_rotate(np)
+                    x = self._root
+            else:
+                s = self._left(np)
+                if self._is_red(s):
+                    self._set_red(s, False)
+                    self._set_red(np, True)
+                    self._right_rotate(np)
+                    s = self._left(np)
+                if (not self._is_red(self._left(s))
+                        and not self._is_red(self._right(s))):
+                    self._set_red(s, True)
+                    x = np
+                    np = self._parent(x)
+                else:
+                    if not self._is_red(self._left(s)):
+                        self._set_red(self._right(s), False)
+                        self._set_red(s, True)
+                        self._left_rotate(s)
+                        s = self._left(np)
+                    self._set_red(s, self._is_red(np))
+                    self._set_red(np, False)
+                    self._set_red(self._left(s), False)
+                    self._right_rotate(np)
+                    x = self._root
+        self._set_red(x, False)
+
+    def _transplant(self: T, u: int, v: int) -> None:
+        up = self._parent(u)
+        if up == NIL:
+            self._root = v
+        elif u == self._left(up):
+            self._set_left(up, v)
+        else:
+            self._set_right(up, v)
+        if v != NIL:
+            self._set_parent(v, up)
+
+    def _left_rotate(self: T, x: int) -> None:
+        y = self._right(x)
+        self._set_right(x, self._left(y))
+        if self._left(y) != NIL:
+            self._set_parent(self._left(y), x)
+        xp = self._parent(x)
+        self._set_parent(y, xp)
+        if xp == NIL:
+            self._root = y
+        elif x == self._left(xp):
+            self._set_left(xp, y)
+        else:
+            self._set_right(xp, y)
+        self._set_left(y, x)
+        self._set_parent(x, y)
+
+    def _right_rotate(self: T, x: int) -> None:
+        y = self._left(x)
+        self._set_left(x, self._right(y))
+        if self._right(y) != NIL:
+            self._set_parent(self._right(y), x)
+        xp = self._parent(x)
+        self._set_parent(y, xp)
+        if xp == NIL:
+            self._root = y
+        elif x == self._right(xp):
+            self._set_right(xp, y)
+        else:
+            self._set_left(xp, y)
+        self._set_right(y, x)
+        self._set_parent(x, y)
+
+    def _validate(self: T, n: int, lo: Optional[Any],
+                  hi: Optional[Any]) -> tuple[bool, int]:
+        """
+        Returns (is_valid, black_height) for the subtree rooted at n.
+        """
+        if n == NIL:
+            return True, 0
+        key = self._get_key(n)
+        if lo is not None and not lo < key:
+            return False, -1
+        if hi is not None and not key < hi:
+            return False, -1
+        left, right = self._left(n), self._right(n)
+        for child in (left, right):
+            if child != NIL and self._parent(child) != n:
+                return False, -1
+        red = self._is_red(n)
+        if red and (self._is_red(left) or self._is_red(right)):
+            return False, -1
+        left_valid, left_bh = self._validate(left, lo, key)
+        right_valid, right_bh = self._validate(right, key, hi)
+        if not left_valid or not right_valid or left_bh != right_bh:
+            return False, -1
+        return True, left_bh + (0 if red else 1)
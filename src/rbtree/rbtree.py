@@ -1,6 +1,16 @@
-from typing import Any, Optional, TypeVar, Iterator
+import asyncio
+import copy
+import gc
+from concurrent.futures import Executor
+from typing import (
+    Any, AsyncIterator, Callable, Iterable, Optional, TypeVar, Iterator
+)
 from enum import Enum
-from rbtree.node import Node
+from rbtree.augmentation import Augmentation, EMPTY
+from rbtree.cache import LookupCache
+from rbtree.frozen import FrozenTree, freeze
+from rbtree.memory import tree_memory_usage
+from rbtree.node import Node, PooledNode
 from rbtree.node_base import NodeBase
 
 
@@ -12,11 +22,57 @@ class IteratorType(Enum):
 
 T = TypeVar('T', bound='RedBlackTree')
 
+# Change event types.
+INSERT = "insert"
+DELETE = "delete"
+
+# Flags used when flattening the tree.
+_HAS_LEFT = 1
+_HAS_RIGHT = 2
+_RED = 4
+
+# Node types whose ordering and equality are those of their keys, so they
+# can be found by key in the hash index. Subclasses may order differently.
+_PLAIN_NODES = (Node, PooledNode)
+
 
 class RedBlackTree():
-    def __init__(self: T) -> None:
+    def __init__(self: T,
+                 augmentation: Optional[Augmentation] = None,
+                 cache_size: int = 0,
+                 lazy_delete: bool = False,
+                 compact_ratio: float = 0.5,
+                 pool_size: int = 0,
+                 hash_index: bool = False) -> None:
         self._root: NodeBase = NodeBase.NIL
+        # The leftmost and rightmost nodes, including tombstones.
+        self._min_node: NodeBase = NodeBase.NIL
+        self._max_node: NodeBase = NodeBase.NIL
+        self._augmentation = augmentation
+        self._cache = LookupCache(cache_size) if cache_size > 0 else None
+        # The live Nodes by key, for exact-match searches in O(1). Custom
+        # nodes and nodes without a hashable key are counted instead, and
+        # while there are any, a miss in the index falls back to searching
+        # the tree.
+        self._index: Optional[dict[Any, NodeBase]] = (
+            {} if hash_index else None
+        )
+        self._unindexed = 0
+        # In lazy delete mode, deleted nodes stay in the tree as tombstones
+        # until more than compact_ratio of all nodes are tombstones.
+        self.lazy_delete = lazy_delete
+        self.compact_ratio = compact_ratio
+        self._tombstones = 0
+        self._subscribers: list[Callable[[str, NodeBase], None]] = []
+        # Up to pool_size deleted nodes are kept for reuse by insert.
+        self.pool_size = pool_size
+        self._pool: list[PooledNode] = []
+        # Keys are wrapped in a single node type, so that comparisons
+        # between probes and tree nodes stay monomorphic.
+        self._node_type = PooledNode if pool_size else Node
         self.size = 0
+        # Incremented on every change, to detect changes during iteration.
+        self._version = 0
         self._iterator_include_nulls = False
         self._traversal_type = IteratorType.PRE
 
@@ -35,14 +91,116 @@ class RedBlackTree():
     def __len__(self: T) -> int:
         return self.size
 
+    def __contains__(self: T, key: Any) -> bool:
+        return not self.search(key).is_null()
+
     def __str__(self: T) -> str:
         return self.__print_helper(self.root, "", 'root')
 
+    def __getstate__(self: T) -> dict:
+        """
+        Store the tree as a flat preorder list of unlinked nodes and a
+        matching string of shape and color flags.
+        """
+        state = self.__dict__.copy()
+        del state["_root"]
+        del state["_min_node"]
+        del state["_max_node"]
+        if self._cache is not None:
+            # Cached nodes belong to this tree, so start a copy afresh.
+            state["_cache"] = LookupCache(self._cache.capacity)
+        # Subscriptions and pooled nodes are not copied.
+        state["_subscribers"] = []
+        state["_pool"] = []
+        if self._index is not None:
+            # The index is rebuilt from the nodes.
+            state["_index"] = {}
+        nodes = []
+        shape = bytearray()
+        stack = [] if self.root.is_null() else [self.root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            flags = 0
+            if not node.left.is_null():
+                flags |= _HAS_LEFT
+            if not node.right.is_null():
+                flags |= _HAS_RIGHT
+                stack.append(node.right)
+            if node.is_red():
+                flags |= _RED
+            if flags & _HAS_LEFT:
+                stack.append(node.left)
+            shape.append(flags)
+        state["_nodes"] = nodes
+        state["_shape"] = bytes(shape)
+        return state
+
+    def __setstate__(self: T, state: dict) -> None:
+        """
+        Relink the nodes in O(n). No comparisons or rebalancing are needed.
+        """
+        state = state.copy()
+        nodes = state.pop("_nodes")
+        shape = state.pop("_shape")
+        self.__dict__.update(state)
+        self._root = NodeBase.NIL
+        # Each slot is a parent waiting for a child, and which side.
+        slots: list[tuple[NodeBase, bool]] = []
+        for node, flags in zip(nodes, shape):
+            node.left = NodeBase.NIL
+            node.right = NodeBase.NIL
+            node._red = bool(flags & _RED)
+            if slots:
+                parent, is_left = slots.pop()
+                node.parent = parent
+                if is_left:
+                    parent.left = node
+                else:
+                    parent.right = node
+            else:
+                node.parent = NodeBase.NIL
+                self._root = node
+            if flags & _HAS_RIGHT:
+                slots.append((node, False))
+            if flags & _HAS_LEFT:
+                slots.append((node, True))
+        # The cached extremes are live nodes.
+        low = self._leftmost(self._root)
+        high = self._rightmost(self._root)
+        self._min_node = self.successor(low) if low.is_deleted() else low
+        self._max_node = self.predecessor(high) if high.is_deleted() else high
+        if self._index is not None:
+            self._reindex(self.__live(nodes))
+
+    def __copy__(self: T) -> T:
+        """
+        A new tree of new nodes that share the original keys.
+        """
+        state = self.__getstate__()
+        state["_nodes"] = [copy.copy(node) for node in state["_nodes"]]
+        tree = self.__class__.__new__(self.__class__)
+        tree.__setstate__(state)
+        return tree
+
+    def __deepcopy__(self: T, memo: dict) -> T:
+        tree = self.__class__.__new__(self.__class__)
+        memo[id(self)] = tree
+        tree.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return tree
+
     # Getters and Setters and Properties
     @property
     def root(self: T) -> NodeBase:
         return self._root
 
+    @property
+    def cache(self: T) -> Optional[LookupCache]:
+        """
+        The search cache, if the tree was constructed with a cache_size.
+        """
+        return self._cache
+
     # Public Methods
 
     def include_nulls(self: T) -> None:
@@ -67,115 +225,558 @@ class RedBlackTree():
         self._traversal_type = IteratorType.IN
 
     def preorder(self: T, include_nulls: bool = False) -> list:
-        return self._pre_order_helper(self.root, include_nulls)
+        return self.__live(self._pre_order_helper(self.root, include_nulls))
 
     def inorder(self: T, include_nulls: bool = False) -> list:
-        return self._in_order_helper(self.root, include_nulls)
+        return self.__live(self._in_order_helper(self.root, include_nulls))
 
     def postorder(self: T, include_nulls: bool = False) -> list:
-        return self._post_order_helper(self.root, include_nulls)
+        return self.__live(self._post_order_helper(self.root, include_nulls))
+
+    @property
+    def tombstones(self: T) -> int:
+        """
+        The number of lazily deleted nodes still in the tree.
+        """
+        return self._tombstones
+
+    def compact(self: T) -> None:
+        """
+        Physically remove all tombstones, rebuilding the tree in O(n).
+        """
+        if self._tombstones:
+            self._rebuild(self.inorder())
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator[NodeBase]:
+        """
+        Lazily iterate over the nodes with keys between lo and hi.
+        A bound of None is unbounded. Runs in O(log n + k).
+        """
+        lo_node = None if lo is None else self._make_node(lo)
+        hi_node = None if hi is None else self._make_node(hi)
+
+        def below(node: NodeBase) -> bool:
+            if lo_node is None:
+                return False
+            return node < lo_node or (not inclusive[0] and node == lo_node)
+
+        def above(node: NodeBase) -> bool:
+            if hi_node is None:
+                return False
+            return hi_node < node or (not inclusive[1] and node == hi_node)
+
+        # The stack holds the pending nodes, nearest on top.
+        stack = []
+        node = self.root
+        while not node.is_null():
+            if not reverse and below(node):
+                node = node.right
+            elif reverse and above(node):
+                node = node.left
+            else:
+                stack.append(node)
+                node = node.right if reverse else node.left
+        past_end = below if reverse else above
+        while stack:
+            node = stack.pop()
+            if past_end(node):
+                return
+            if not node.is_deleted():
+                yield node
+            node = node.left if reverse else node.right
+            while not node.is_null():
+                stack.append(node)
+                node = node.right if reverse else node.left
 
     def search(self: T, key: Any) -> NodeBase:
         """
         Find the node with the given key
         """
-        node: NodeBase
-        if isinstance(key, NodeBase):
-            node = key
+        if self._index is not None:
+            probe = key.key if type(key) in _PLAIN_NODES else key
+            if not isinstance(probe, NodeBase):
+                try:
+                    node = self._index.get(probe)
+                except TypeError:
+                    node = None
+                else:
+                    if node is not None:
+                        return node
+                    if not self._unindexed:
+                        return NodeBase.NIL
+        if self._cache is not None and not isinstance(key, NodeBase):
+            try:
+                node = self._cache.get(key)
+            except TypeError:
+                # Unhashable keys cannot be cached.
+                return self._search_tree_helper(self.root,
+                                                self._node_type(key))
+            if node is None:
+                node = self._search_tree_helper(self.root,
+                                                self._node_type(key))
+                self._cache.put(key, node)
+            return node
+        return self._search_tree_helper(self.root, self._make_node(key))
+
+    def search_many(self: T, keys: Iterable) -> list[NodeBase]:
+        """
+        Find the node for each key, or NIL if it is not present, in the
+        order given. Any iterable is accepted, including array.array and
+        NumPy arrays. The keys are sorted and found in a single in-order
+        walk which skips the subtrees between neighbouring keys.
+        """
+        if hasattr(keys, "tolist"):
+            # Convert array elements to Python scalars once, up front.
+            keys = keys.tolist()
+        probes = list(keys)
+        results: list[NodeBase] = [NodeBase.NIL] * len(probes)
+        if not probes or self.root.is_null():
+            return results
+
+        key_of: Callable[[NodeBase], Any]
+        if isinstance(probes[0], NodeBase):
+            def key_of(node: NodeBase) -> Any: return node
         else:
-            node = Node(key)
-        return self._search_tree_helper(self.root, node)
+            def key_of(node: NodeBase) -> Any: return getattr(node, "key")
+
+        # The stack holds the pending in-order nodes, smallest on top.
+        stack: list[NodeBase] = []
+        node = self.root
+        for i in sorted(range(len(probes)), key=probes.__getitem__):
+            probe = probes[i]
+            while stack and key_of(stack[-1]) < probe:
+                node = stack.pop().right
+            while not node.is_null():
+                key = key_of(node)
+                if key < probe:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    if not probe < key:
+                        break
+                    node = node.left
+            node = NodeBase.NIL
+            if stack and key_of(stack[-1]) == probe:
+                if not stack[-1].is_deleted():
+                    results[i] = stack[-1]
+        return results
+
+    def contains_many(self: T, keys: Iterable) -> list[bool]:
+        """
+        Report whether each key is present, in the order given.
+        """
+        return [not node.is_null() for node in self.search_many(keys)]
 
     def minimum(self: T, node: Optional[NodeBase] = None) -> NodeBase:
+        """
+        The minimum of the subtree rooted at node, or of the whole tree in
+        O(1) if node is not given.
+        """
         if node is None:
-            node = self.root
-        if node.is_null():
-            return node
-        while not node.left.is_null():
-            node = node.left
-        return node
+            x = self._min_node
+            if x.is_null() and not self._tombstones:
+                # The tree may have been linked up by hand.
+                x = self._leftmost(self.root)
+        else:
+            x = self._leftmost(node)
+        while x.is_deleted():
+            x = self._next(x)
+        return x
 
     def maximum(self: T, node: Optional[NodeBase] = None) -> NodeBase:
         if node is None:
-            node = self.root
-        if node.is_null():
-            return node
-        while not node.right.is_null():
-            node = node.right
-        return node
+            x = self._max_node
+            if x.is_null() and not self._tombstones:
+                x = self._rightmost(self.root)
+        else:
+            x = self._rightmost(node)
+        while x.is_deleted():
+            x = self._prev(x)
+        return x
 
-    def successor(self: T, x: NodeBase) -> Optional[NodeBase]:
-        if not x.right.is_null():
-            return self.minimum(x.right)
+    def peek_min(self: T) -> NodeBase:
+        return self.minimum()
 
-        y = x.parent
+    def peek_max(self: T) -> NodeBase:
+        return self.maximum()
 
-        while not y.is_null() and x == y.right:
-            x = y
-            y = y.parent
-        return y
+    def pop_min(self: T) -> NodeBase:
+        """
+        Remove and return the minimum node, or NIL if the tree is empty.
+        """
+        node = self.minimum()
+        self.__delete_found(node)
+        return node
 
-    def predecessor(self: T,  x: NodeBase) -> Optional[NodeBase]:
-        if (not x.left.is_null()):
-            return self.maximum(x.left)
+    def pop_max(self: T) -> NodeBase:
+        """
+        Remove and return the maximum node, or NIL if the tree is empty.
+        """
+        node = self.maximum()
+        self.__delete_found(node)
+        return node
 
-        y = x.parent
-        while not y.is_null() and x == y.left:
-            x = y
-            y = y.parent
+    def successor(self: T, x: NodeBase) -> NodeBase:
+        y = self._next(x)
+        while y.is_deleted():
+            y = self._next(y)
+        return y
 
+    def predecessor(self: T,  x: NodeBase) -> NodeBase:
+        y = self._prev(x)
+        while y.is_deleted():
+            y = self._prev(y)
         return y
 
+    def nearest(self: T, x: Any, k: int = 1,
+                distance: Optional[Callable[[Any, Any], Any]] = None
+                ) -> list[NodeBase]:
+        """
+        The k nodes whose keys are closest to x, nearest first. Ties go to
+        the smaller key. x need not be present, and is compared with the
+        node keys directly. distance(x, key) defaults to abs(x - key) and
+        must grow as keys move away from x in either direction.
+        Runs in O(log n + k).
+        """
+        if distance is None:
+            def distance(a: Any, b: Any) -> Any: return abs(a - b)
+
+        # The nodes either side of where x would be inserted.
+        lo: NodeBase = NodeBase.NIL
+        hi: NodeBase = NodeBase.NIL
+        node = self.root
+        while not node.is_null():
+            if x < getattr(node, "key"):
+                hi = node
+                node = node.left
+            else:
+                lo = node
+                node = node.right
+        while lo.is_deleted():
+            lo = self._prev(lo)
+        while hi.is_deleted():
+            hi = self._next(hi)
+
+        output: list[NodeBase] = []
+        while len(output) < k and not (lo.is_null() and hi.is_null()):
+            if hi.is_null() or (
+                not lo.is_null()
+                and not distance(x, getattr(hi, "key"))
+                < distance(x, getattr(lo, "key"))
+            ):
+                output.append(lo)
+                lo = self.predecessor(lo)
+            else:
+                output.append(hi)
+                hi = self.successor(hi)
+        return output
+
     def insert(self: T, key: Any) -> None:
         # Allow the user to provide a custom node.
-        node: NodeBase
-        if isinstance(key, NodeBase):
-            node = key
-        else:
-            node = Node(key)
+        node = self._new_node(key)
         y: NodeBase = NodeBase.NIL
         x = self.root
 
         while not x.is_null():
             y = x
             if node == x:
+                if x.is_deleted():
+                    self.__revive(x, node)
+                elif node is not key:
+                    self._recycle(node)
                 return
             if node < x:
                 x = x.left
             else:
                 x = x.right
 
+        # The node may have been copied from, or used in, another tree.
+        node.left = NodeBase.NIL
+        node.right = NodeBase.NIL
+        node._red = True
+        node._deleted = False
         node.parent = y
         if y.is_null():
             self._root = node
+            self._min_node = node
+            self._max_node = node
         elif node < y:
             y.left = node
+            if y is self._min_node:
+                self._min_node = node
         else:
             y.right = node
+            if y is self._max_node:
+                self._max_node = node
+        if self._tombstones:
+            self.__extend_extremes(node)
 
         self.size += 1
+        self._version += 1
+        self._invalidate(node)
+        self._index_add(node)
+        self._update_path(node)
 
         if node.parent.is_null():
             node.color = "black"
-            return
+        elif not node.parent.parent.is_null():
+            self._fix_insert(node)
+        # Subscribers only see the tree once it is balanced again.
+        self._notify(INSERT, node)
+
+    def delete(self: T, key: Any) -> None:
+        if self.lazy_delete:
+            self.__delete_lazily(self.search(key))
+        else:
+            self._delete_node_helper(self.root, self._make_node(key))
+
+    def delete_range(self: T, lo: Any = None, hi: Any = None,
+                     inclusive: tuple[bool, bool] = (True, True)) -> int:
+        """
+        Delete every node with a key between lo and hi, and return how many
+        were deleted. A bound of None is unbounded.
+
+        The k doomed nodes are found in O(log n + k). If deleting them one
+        at a time would cost more than rebuilding the tree from the nodes
+        which remain, the tree is rebuilt instead, so removing most of a
+        tree costs close to the number of survivors.
+        """
+        doomed = list(self.irange(lo, hi, inclusive))
+        count = len(doomed)
+        if count == 0:
+            return 0
+        remaining = self.size - count
+        if count * self.size.bit_length() <= remaining + self._tombstones:
+            for node in doomed:
+                self.__delete_found(node)
+            if not self.lazy_delete:
+                for node in doomed:
+                    self._recycle(node)
+            return count
+
+        survivors: list[NodeBase] = []
+        if lo is not None:
+            survivors.extend(self.irange(hi=lo,
+                                         inclusive=(True, not inclusive[0])))
+        if hi is not None:
+            survivors.extend(self.irange(lo=hi,
+                                         inclusive=(not inclusive[1], True)))
+        # The rebuild walks the old tree for tombstones, so the doomed
+        # nodes are unlinked only once it is done.
+        self._rebuild(survivors)
+        for node in doomed:
+            node.parent = NodeBase.NIL
+            node.left = NodeBase.NIL
+            node.right = NodeBase.NIL
+        for node in doomed:
+            self._notify(DELETE, node)
+        for node in doomed:
+            self._recycle(node)
+        return count
+
+    def truncate_below(self: T, key: Any, inclusive: bool = False) -> int:
+        """
+        Delete every node with a key less than key, or equal to it if
+        inclusive, and return how many were deleted.
+        """
+        return self.delete_range(hi=key, inclusive=(True, inclusive))
+
+    def truncate_above(self: T, key: Any, inclusive: bool = False) -> int:
+        """
+        Delete every node with a key greater than key, or equal to it if
+        inclusive, and return how many were deleted.
+        """
+        return self.delete_range(lo=key, inclusive=(inclusive, True))
+
+    def insert_many(self: T, keys: Iterable) -> None:
+        for key in keys:
+            self.insert(key)
+
+    def delete_many(self: T, keys: Iterable) -> None:
+        for key in keys:
+            self.delete(key)
+
+    # Asyncio Methods
+
+    def aiter_inorder(self: T, chunk: int = 1000) -> AsyncIterator[NodeBase]:
+        """
+        Iterate over all nodes in order, yielding to the event loop after
+        every chunk nodes.
+        """
+        return self.airange(chunk=chunk)
+
+    async def airange(self: T, lo: Any = None, hi: Any = None,
+                      inclusive: tuple[bool, bool] = (True, True),
+                      reverse: bool = False,
+                      chunk: int = 1000) -> AsyncIterator[NodeBase]:
+        """
+        An asynchronous irange, yielding to the event loop after every chunk
+        nodes. Raises RuntimeError if the tree is changed while iterating.
+        """
+        version = self._version
+        count = 0
+        for node in self.irange(lo, hi, inclusive, reverse):
+            yield node
+            count += 1
+            if count % chunk == 0:
+                await asyncio.sleep(0)
+            if self._version != version:
+                raise RuntimeError("RedBlackTree changed during iteration")
+
+    async def ainsert_many(self: T, keys: Iterable, chunk: int = 1000,
+                           offload: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> None:
+        """
+        Insert the keys, yielding to the event loop after every chunk keys.
+        Batches of at least offload keys are instead inserted on a thread
+        of the executor. The tree must not be used until that finishes.
+        """
+        await self.__abatch(self.insert, keys, chunk, offload, executor)
+
+    async def adelete_many(self: T, keys: Iterable, chunk: int = 1000,
+                           offload: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> None:
+        """
+        Delete the keys, yielding to the event loop after every chunk keys.
+        """
+        await self.__abatch(self.delete, keys, chunk, offload, executor)
+
+    def aggregate(self: T, lo: Any = None, hi: Any = None,
+                  default: Any = None) -> Any:
+        """
+        Combine the values of all nodes with lo <= key <= hi, in key order.
+        A bound of None is unbounded. Runs in O(log n).
+        """
+        aug = self._augmentation
+        if aug is None:
+            raise ValueError("Tree does not have an augmentation")
+        lo_node = None if lo is None else self._make_node(lo)
+        hi_node = None if hi is None else self._make_node(hi)
+
+        # Find the highest node within the range.
+        node = self.root
+        while not node.is_null():
+            if lo_node is not None and node < lo_node:
+                node = node.right
+            elif hi_node is not None and hi_node < node:
+                node = node.left
+            else:
+                break
+        if node.is_null():
+            return default
+
+        # Everything >= lo in the left subtree, in key order.
+        left = EMPTY
+        x = node.left
+        while not x.is_null():
+            if lo_node is not None and x < lo_node:
+                x = x.right
+            else:
+                part = aug.merge(aug.own(x), aug.of(x.right))
+                left = aug.merge(part, left)
+                x = x.left
+
+        # Everything <= hi in the right subtree, in key order.
+        right = EMPTY
+        x = node.right
+        while not x.is_null():
+            if hi_node is not None and hi_node < x:
+                x = x.left
+            else:
+                part = aug.merge(aug.of(x.left), aug.own(x))
+                right = aug.merge(right, part)
+                x = x.right
 
-        if node.parent.parent.is_null():
+        result = aug.merge(aug.merge(left, aug.own(node)), right)
+        return default if result is EMPTY else result
+
+    def diff(self: T, other: 'RedBlackTree') -> Iterator[tuple[str, NodeBase]]:
+        """
+        The changes which turn this tree into other, in key order, as
+        (INSERT, node of other) and (DELETE, node of this tree). Both trees
+        are walked together in O(n + m).
+        """
+        if other is self or other.root is self.root:
             return
+        mine = self.irange()
+        theirs = other.irange()
+        a = next(mine, None)
+        b = next(theirs, None)
+        while a is not None and b is not None:
+            if a is b or a == b:
+                a = next(mine, None)
+                b = next(theirs, None)
+            elif a < b:
+                yield DELETE, a
+                a = next(mine, None)
+            else:
+                yield INSERT, b
+                b = next(theirs, None)
+        while a is not None:
+            yield DELETE, a
+            a = next(mine, None)
+        while b is not None:
+            yield INSERT, b
+            b = next(theirs, None)
+
+    def subscribe(self: T, callback: Callable[[str, NodeBase], None]
+                  ) -> Callable[[], None]:
+        """
+        Call callback(INSERT, node) or callback(DELETE, node) after every
+        change to the tree. Returns a function which unsubscribes.
+        """
+        self._subscribers.append(callback)
 
-        self._fix_insert(node)
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
 
-    def delete(self: T, key: Any) -> None:
-        node: NodeBase
-        if isinstance(key, NodeBase):
-            node = key
-        else:
-            node = Node(key)
-        self._delete_node_helper(self.root, node)
+        return unsubscribe
+
+    def apply_changes(self: T,
+                      changes: Iterable[tuple[str, NodeBase]]) -> None:
+        """
+        Apply changes from diff or a subscription to this tree. Inserted
+        nodes are copied, so they are not shared with the other tree.
+        """
+        for op, node in changes:
+            if op == INSERT:
+                self.insert(copy.copy(node))
+            elif op == DELETE:
+                self.delete(node)
+            else:
+                raise ValueError("Unknown change " + str(op))
+
+    def memory_usage(self: T, deep: bool = False) -> dict:
+        """
+        Report the bytes used by the nodes, their keys if deep, and the
+        tree's own structures. See rbtree.memory.tree_memory_usage.
+        """
+        return tree_memory_usage(self, deep)
+
+    def gc_freeze(self: T) -> None:
+        """
+        Collect garbage, then move every object the collector tracks,
+        including this tree's nodes, to the permanent generation so later
+        collections skip them. This applies to the whole process, and is
+        undone by gc.unfreeze. Nodes deleted afterwards are still freed,
+        since removal breaks their links.
+        """
+        gc.collect()
+        gc.freeze()
+
+    def freeze(self: T) -> FrozenTree:
+        """
+        An immutable, array-backed copy of the tree for fast lookups.
+        """
+        return freeze(self.irange())
 
     def to_mindmap(self: T) -> str:
         null_depths = []
         output = "@startmindmap\n"
-        for node in self.preorder(True):
+        for node in self._pre_order_helper(self.root, True):
             if not node.is_null():
                 if node.right.is_null():
                     null_depths.append(node.depth() + 1)
@@ -191,6 +792,193 @@ class RedBlackTree():
 
     # Protected Methods
 
+    async def __abatch(self: T, operation: Callable[[Any], None],
+                       keys: Iterable, chunk: int, offload: Optional[int],
+                       executor: Optional[Executor]) -> None:
+        keys = list(keys)
+        if offload is not None and len(keys) >= offload:
+            def run() -> None:
+                for key in keys:
+                    operation(key)
+            await asyncio.get_running_loop().run_in_executor(executor, run)
+            return
+        for i, key in enumerate(keys, 1):
+            operation(key)
+            if i % chunk == 0:
+                await asyncio.sleep(0)
+
+    def _make_node(self: T, key: Any) -> NodeBase:
+        """
+        Wrap a key in a Node, unless it is already a node.
+        """
+        if isinstance(key, NodeBase):
+            return key
+        return self._node_type(key)
+
+    def _new_node(self: T, key: Any) -> NodeBase:
+        """
+        Wrap a key being inserted in a node, reusing a pooled node if there
+        is one.
+        """
+        if isinstance(key, NodeBase):
+            return key
+        if self._pool:
+            node = self._pool.pop()
+            node._key = key
+            return node
+        return self._node_type(key)
+
+    def _recycle(self: T, node: NodeBase) -> None:
+        """
+        Return a removed node to the pool, if the tree created it and there
+        is room. Nodes may have been kept by subscribers, so nothing is
+        pooled while there are any.
+        """
+        if (type(node) is PooledNode
+                and len(self._pool) < self.pool_size
+                and not self._subscribers):
+            node._key = None
+            self._pool.append(node)
+
+    def _leftmost(self: T, node: NodeBase) -> NodeBase:
+        if node.is_null():
+            return node
+        while not node.left.is_null():
+            node = node.left
+        return node
+
+    def _rightmost(self: T, node: NodeBase) -> NodeBase:
+        if node.is_null():
+            return node
+        while not node.right.is_null():
+            node = node.right
+        return node
+
+    def _next(self: T, x: NodeBase) -> NodeBase:
+        """
+        The in-order successor, including tombstones.
+        """
+        if not x.right.is_null():
+            return self._leftmost(x.right)
+
+        y = x.parent
+
+        while not y.is_null() and x == y.right:
+            x = y
+            y = y.parent
+        return y
+
+    def _prev(self: T, x: NodeBase) -> NodeBase:
+        """
+        The in-order predecessor, including tombstones.
+        """
+        if (not x.left.is_null()):
+            return self._rightmost(x.left)
+
+        y = x.parent
+        while not y.is_null() and x == y.left:
+            x = y
+            y = y.parent
+
+        return y
+
+    def _rebuild(self: T, nodes: list[NodeBase]) -> None:
+        """
+        Replace the tree with a balanced tree of the given nodes, which must
+        be in order, in O(n). Only the deepest level is colored red.
+        """
+        if self._tombstones:
+            # Dropped tombstones are unlinked, so refcounting can free them.
+            for node in self._in_order_helper(self.root):
+                if node.is_deleted():
+                    node.parent = NodeBase.NIL
+                    node.left = NodeBase.NIL
+                    node.right = NodeBase.NIL
+        aug = self._augmentation
+        red_depth = len(nodes).bit_length() - 1
+
+        def build(lo: int, hi: int, depth: int, parent: NodeBase) -> NodeBase:
+            if lo >= hi:
+                return NodeBase.NIL
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            node.parent = parent
+            node._red = depth == red_depth and depth > 0
+            node.left = build(lo, mid, depth + 1, node)
+            node.right = build(mid + 1, hi, depth + 1, node)
+            if aug is not None:
+                aug.update(node)
+            return node
+
+        self._root = build(0, len(nodes), 0, NodeBase.NIL)
+        self._min_node = nodes[0] if nodes else NodeBase.NIL
+        self._max_node = nodes[-1] if nodes else NodeBase.NIL
+        self.size = len(nodes)
+        self._tombstones = 0
+        self._version += 1
+        if self._cache is not None:
+            self._cache.clear()
+        if self._index is not None:
+            self._reindex(nodes)
+
+    def _notify(self: T, op: str, node: NodeBase) -> None:
+        for callback in list(self._subscribers):
+            callback(op, node)
+
+    def _invalidate(self: T, node: NodeBase) -> None:
+        """
+        Drop the cached search result for the key of a node which has been
+        added or removed.
+        """
+        if self._cache is None:
+            return
+        if isinstance(node, Node):
+            self._cache.invalidate(node.key)
+        else:
+            # The key a custom node is searched by is unknown.
+            self._cache.clear()
+
+    def _index_add(self: T, node: NodeBase) -> None:
+        if self._index is None:
+            return
+        if type(node) in _PLAIN_NODES:
+            try:
+                self._index[getattr(node, "key")] = node
+                return
+            except TypeError:
+                pass
+        self._unindexed += 1
+
+    def _index_remove(self: T, node: NodeBase) -> None:
+        if self._index is None:
+            return
+        if type(node) in _PLAIN_NODES:
+            try:
+                del self._index[getattr(node, "key")]
+                return
+            except TypeError:
+                pass
+        self._unindexed -= 1
+
+    def _reindex(self: T, nodes: list[NodeBase]) -> None:
+        """
+        Rebuild the hash index from the live nodes.
+        """
+        self._index = {}
+        self._unindexed = 0
+        for node in nodes:
+            self._index_add(node)
+
+    def _update_path(self: T, node: NodeBase) -> None:
+        """
+        Recompute the aggregates from node up to the root.
+        """
+        if self._augmentation is None:
+            return
+        while not node.is_null():
+            self._augmentation.update(node)
+            node = node.parent
+
     # Balance the tree after insertion
     def _fix_insert(self: T, node: NodeBase) -> None:
         while node.parent.is_red():
@@ -265,63 +1053,82 @@ class RedBlackTree():
         if z.is_null():
             # Key not in tree.
             return
+        self._remove_node(z)
+        self._recycle(z)
 
+    def _remove_node(self: T, z: NodeBase) -> None:
+        """
+        Unlink a node that is known to be in the tree and rebalance.
+        """
+        if z is self._min_node:
+            self._min_node = self.successor(z)
+        if z is self._max_node:
+            self._max_node = self.predecessor(z)
         y = z
         y_original_color = y.color
-        np = z.parent
         if z.left.is_null():
             # If no left child, just scoot the right subtree up
             x = z.right
+            np = z.parent
             self.__rb_transplant(z, z.right)
         elif z.right.is_null():
             # If no right child, just scoot the left subtree up
             x = z.left
+            np = z.parent
             self.__rb_transplant(z, z.left)
         else:
-            y = self.minimum(z.right)
+            y = self._leftmost(z.right)
             y_original_color = y.color
             x = y.right
-            if y.parent == z and not x.is_null():
-                x.parent = y
+            if y.parent is z:
+                np = y
             else:
+                np = y.parent
                 self.__rb_transplant(y, y.right)
                 y.right = z.right
-                if not y.right.is_null():
-                    y.right.parent = y
+                y.right.parent = y
 
             self.__rb_transplant(z, y)
             y.left = z.left
-            if not y.left.is_null():
-                y.left.parent = y
+            y.left.parent = y
             y.color = z.color
+        self._update_path(np)
         if y_original_color == "black":
             self._delete_fix(x, np)
 
+        # Unlinked nodes hold no cycles, so refcounting can free them.
+        z.parent = NodeBase.NIL
+        z.left = NodeBase.NIL
+        z.right = NodeBase.NIL
         self.size -= 1
+        self._version += 1
+        self._invalidate(z)
+        self._index_remove(z)
+        self._notify(DELETE, z)
 
     # Balancing the tree after deletion
     def _delete_fix(self: T, x: NodeBase, np: NodeBase) -> None:
-        while x != self.root and x.is_black():
-            if x == np.left:
+        """
+        x may be NIL, so its parent is tracked separately in np.
+        """
+        while x is not self.root and x.is_black():
+            if x is np.left:
                 s = np.right
                 if s.is_red():
                     s.color = "black"
                     np.color = "red"
                     self._left_rotate(np)
-                    np_new = x.parent
-                    np = np_new
                     s = np.right
 
                 if s.left.is_black() and s.right.is_black():
                     s.color = "red"
                     x = np
+                    np = x.parent
                 else:
                     if s.right.is_black():
                         s.left.color = "black"
                         s.color = "red"
                         self._right_rotate(s)
-                        np_new = x.parent
-                        np = np_new
                         s = np.right
 
                     s.color = np.color
@@ -335,20 +1142,17 @@ class RedBlackTree():
                     s.color = "black"
                     np.color = "red"
                     self._right_rotate(np)
-                    np_new = x.parent
-                    np = np_new
                     s = np.left
 
                 if s.left.is_black() and s.right.is_black():
                     s.color = "red"
                     x = np
+                    np = x.parent
                 else:
                     if s.left.is_black():
                         s.right.color = "black"
                         s.color = "red"
                         self._left_rotate(s)
-                        np_new = x.parent
-                        np = np_new
                         s = np.left
 
                     s.color = np.color
@@ -358,6 +1162,92 @@ class RedBlackTree():
                     x = self.root
         x.color = "black"
 
+    def __live(self: T, nodes: list) -> list:
+        if not self._tombstones:
+            return nodes
+        return [node for node in nodes if not node.is_deleted()]
+
+    def __delete_found(self: T, node: NodeBase) -> None:
+        """
+        Delete a node already found in the tree, without searching for it.
+        """
+        if node.is_null():
+            return
+        if self.lazy_delete:
+            self.__delete_lazily(node)
+        else:
+            self._remove_node(node)
+
+    def __delete_lazily(self: T, z: NodeBase) -> None:
+        """
+        Mark a node as a tombstone without restructuring the tree.
+        """
+        if z.is_null():
+            return
+        z._deleted = True
+        # Keep the cached extremes on live nodes, so that minimum and
+        # maximum never walk over tombstones.
+        if z is self._min_node:
+            self._min_node = self.successor(z)
+        if z is self._max_node:
+            self._max_node = self.predecessor(z)
+        self.size -= 1
+        self._tombstones += 1
+        self._version += 1
+        self._invalidate(z)
+        self._index_remove(z)
+        self._update_path(z)
+        total = self.size + self._tombstones
+        if self._tombstones > self.compact_ratio * total:
+            self.compact()
+        self._notify(DELETE, z)
+
+    def __revive(self: T, old: NodeBase, new: NodeBase) -> None:
+        """
+        Put a newly inserted node in the place of its tombstone.
+        """
+        if new is not old:
+            new.parent = old.parent
+            new.left = old.left
+            new.right = old.right
+            new._red = old._red
+            if old.parent.is_null():
+                self._root = new
+            elif old is old.parent.left:
+                old.parent.left = new
+            else:
+                old.parent.right = new
+            if not new.left.is_null():
+                new.left.parent = new
+            if not new.right.is_null():
+                new.right.parent = new
+            old.parent = NodeBase.NIL
+            old.left = NodeBase.NIL
+            old.right = NodeBase.NIL
+            if old is self._min_node:
+                self._min_node = new
+            if old is self._max_node:
+                self._max_node = new
+        new._deleted = False
+        self.__extend_extremes(new)
+        self.size += 1
+        self._tombstones -= 1
+        self._version += 1
+        self._invalidate(new)
+        self._index_add(new)
+        self._update_path(new)
+        self._notify(INSERT, new)
+
+    def __extend_extremes(self: T, node: NodeBase) -> None:
+        """
+        Make a new live node the cached minimum or maximum if it passes
+        them. It may lie beyond them with only tombstones in between.
+        """
+        if self._min_node.is_null() or node < self._min_node:
+            self._min_node = node
+        if self._max_node.is_null() or self._max_node < node:
+            self._max_node = node
+
     def __rb_transplant(self: T, u: NodeBase, v: NodeBase) -> None:
         if u.parent.is_null():  # We are removing the root node
             self._root = v
@@ -383,6 +1273,9 @@ class RedBlackTree():
             x.parent.right = y
         y.left = x
         x.parent = y
+        if self._augmentation is not None:
+            self._augmentation.update(x)
+            self._augmentation.update(y)
 
     def _right_rotate(self: T, x: NodeBase) -> None:
         y = x.left
@@ -398,6 +1291,9 @@ class RedBlackTree():
             x.parent.left = y
         y.right = x
         x.parent = y
+        if self._augmentation is not None:
+            self._augmentation.update(x)
+            self._augmentation.update(y)
 
     # Search the tree
     def _search_tree_helper(
@@ -406,7 +1302,7 @@ class RedBlackTree():
         if node.is_null() or node_to_find.is_null():
             return NodeBase.NIL
         if node == node_to_find:
-            return node
+            return NodeBase.NIL if node.is_deleted() else node
 
         if node_to_find < node:
             return self._search_tree_helper(node.left, node_to_find)
@@ -0,0 +1,243 @@
+import bisect
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from typing import Any, Iterable, Iterator, Optional, Sequence, TypeVar
+from rbtree.rbtree import RedBlackTree
+
+
+T = TypeVar('T', bound='ShardedRedBlackTree')
+
+
+def _shard_worker(conn: Connection) -> None:
+    """
+    Serve commands for a single shard until told to stop. Every reply
+    carries the size of the shard, even when a batch fails partway.
+    """
+    tree = RedBlackTree()
+    while True:
+        command = conn.recv()
+        if command is None:
+            break
+        op, args = command
+        reply: tuple[bool, Any]
+        try:
+            result: Any = None
+            if op == "insert":
+                for key in args:
+                    tree.insert(key)
+            elif op == "delete":
+                for key in args:
+                    tree.delete(key)
+            elif op == "contains":
+                result = [not tree.search(key).is_null() for key in args]
+            elif op == "range":
+                lo, hi, inclusive = args
+                result = [getattr(node, "key")
+                          for node in tree.irange(lo, hi, inclusive)]
+            elif op == "take":
+                result = [node.key for node in tree.inorder()]
+                tree = RedBlackTree()
+            elif op == "len":
+                result = len(tree)
+            else:
+                raise ValueError("Unknown shard command " + op)
+            reply = (True, result)
+        except Exception as e:
+            reply = (False, e)
+        conn.send(reply + (len(tree),))
+    conn.close()
+
+
+class ShardedRedBlackTree():
+    """
+    A set of keys partitioned by range across worker processes.
+
+    Shard i holds the keys k with boundaries[i - 1] <= k < boundaries[i].
+    Each shard is a RedBlackTree owned by its own process, so batches are
+    processed on all shards at once. Keys must be picklable.
+
+    After each batch, the shards are rebalanced if the largest holds more
+    than skew times as many keys as the smallest. A skew of None turns
+    this off.
+    """
+
+    def __init__(self: T, shards: Optional[int] = None,
+                 boundaries: Optional[Sequence] = None,
+                 skew: Optional[float] = 2.0,
+                 context: Any = None) -> None:
+        if boundaries is not None:
+            shards = len(boundaries) + 1
+        elif shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1:
+            raise ValueError("A sharded tree needs at least one shard")
+        if skew is not None and skew <= 1:
+            raise ValueError("skew must be greater than 1")
+        # Boundaries are learned from the first batch if not given.
+        self.boundaries = [] if boundaries is None else sorted(boundaries)
+        self._sized = boundaries is not None
+        self.skew = skew
+        self._sizes = [0] * shards
+        ctx = multiprocessing.get_context(context)
+        self._conns: list[Connection] = []
+        self._processes = []
+        for _ in range(shards):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_shard_worker, args=(child_conn,), daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+    # Dunder Methods
+
+    def __len__(self: T) -> int:
+        return sum(self._sizes)
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self.contains_many([key])[0]
+
+    def __iter__(self: T) -> Iterator:
+        return self.irange()
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self: T, *args: Any) -> None:
+        self.close()
+
+    # Public Methods
+
+    @property
+    def shards(self: T) -> int:
+        return len(self._conns)
+
+    def shard_sizes(self: T) -> list[int]:
+        return list(self._sizes)
+
+    def insert(self: T, key: Any) -> None:
+        self.insert_many([key])
+
+    def delete(self: T, key: Any) -> None:
+        self.delete_many([key])
+
+    def insert_many(self: T, keys: Iterable) -> None:
+        keys = list(keys)
+        if not self._sized and len(self) == 0 and keys:
+            self.boundaries = self._quantiles(sorted(keys))
+            self._sized = True
+        self._scatter("insert", self._route(keys))
+        if self.is_skewed():
+            self.rebalance()
+
+    def delete_many(self: T, keys: Iterable) -> None:
+        self._scatter("delete", self._route(keys))
+        if self.is_skewed():
+            self.rebalance()
+
+    def contains_many(self: T, keys: Iterable) -> list[bool]:
+        """
+        Report whether each key is present, in the order given.
+        """
+        keys = list(keys)
+        positions: dict[int, list[int]] = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(self._shard_of(key), []).append(position)
+        batches = {i: [keys[p] for p in batch]
+                   for i, batch in positions.items()}
+        results = self._scatter("contains", batches)
+        found = [False] * len(keys)
+        for i, batch in positions.items():
+            for position, present in zip(batch, results[i]):
+                found[position] = present
+        return found
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True)) -> Iterator:
+        """
+        Iterate over the keys between lo and hi in key order.
+        """
+        first = 0 if lo is None else self._shard_of(lo)
+        last = self.shards - 1 if hi is None else self._shard_of(hi)
+        commands = {i: (lo, hi, inclusive) for i in range(first, last + 1)}
+        results = self._scatter("range", commands)
+        # Shards hold disjoint, ordered ranges, so merging is concatenation.
+        for i in range(first, last + 1):
+            yield from results[i]
+
+    def is_skewed(self: T) -> bool:
+        """
+        True if the largest shard holds more than skew times as many keys
+        as the smallest.
+        """
+        if self.skew is None or self.shards == 1 or len(self) < self.shards:
+            return False
+        return max(self._sizes) > self.skew * min(self._sizes)
+
+    def rebalance(self: T) -> None:
+        """
+        Move the shard boundaries so every shard holds the same number of
+        keys, and redistribute the keys.
+        """
+        taken = self._scatter("take", {i: () for i in range(self.shards)})
+        keys = []
+        for i in range(self.shards):
+            keys.extend(taken[i])
+        self.boundaries = self._quantiles(keys)
+        self._scatter("insert", self._route(keys))
+
+    def close(self: T) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    # Protected Methods
+
+    def _quantiles(self: T, keys: list) -> list:
+        """
+        Boundaries which split the sorted keys into equal shards.
+        """
+        if not keys:
+            return []
+        n = len(keys)
+        return [keys[i * n // self.shards] for i in range(1, self.shards)]
+
+    def _shard_of(self: T, key: Any) -> int:
+        if not self.boundaries:
+            return 0
+        return bisect.bisect_right(self.boundaries, key)
+
+    def _route(self: T, keys: Iterable) -> dict[int, list]:
+        batches: dict[int, list] = {}
+        for key in keys:
+            batches.setdefault(self._shard_of(key), []).append(key)
+        return batches
+
+    def _scatter(self: T, op: str, batches: dict[int, Any]) -> dict[int, Any]:
+        """
+        Send a command to each shard, then gather the replies, so the shards
+        work in parallel. The shard sizes are updated from every reply.
+        """
+        for i, args in batches.items():
+            self._conns[i].send((op, args))
+        results = {}
+        error = None
+        for i in batches:
+            ok, result, self._sizes[i] = self._conns[i].recv()
+            if ok:
+                results[i] = result
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+        return results
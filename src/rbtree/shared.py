@@ -0,0 +1,349 @@
+import bisect
+import secrets
+import struct
+import sys
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterable, Iterator, Optional, TypeVar
+from rbtree.rbtree import RedBlackTree
+
+
+S = TypeVar('S', bound='_Strings')
+T = TypeVar('T', bound='SharedTree')
+W = TypeVar('W', bound='SharedTreeWriter')
+
+# The control segment holds the current version. Version 0 is unpublished.
+_CONTROL = struct.Struct("<Q")
+# Each data segment starts with the key type and the number of keys. Then
+# come the sorted keys as 8 byte values, or for strings, count + 1 offsets
+# into the UTF-8 text which follows them.
+_HEADER = struct.Struct("<c7xQ")
+
+
+def _segment_name(name: str, version: int) -> str:
+    return f"{name}_{version}"
+
+
+def _tracked_name(segment: SharedMemory) -> str:
+    """
+    The name the resource tracker knows the segment by, which on POSIX
+    has a leading slash that SharedMemory.name leaves out.
+    """
+    return str(getattr(segment, "_name"))
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    segment = SharedMemory(name)
+    # Attaching registers the segment with the resource tracker, which
+    # would then unlink it when this process exits.
+    resource_tracker.unregister(_tracked_name(segment), "shared_memory")
+    return segment
+
+
+def _unlink(segment: SharedMemory) -> None:
+    if sys.version_info < (3, 13):
+        # A reader sharing our resource tracker may have unregistered the
+        # segment, and unlink unregisters it again.
+        resource_tracker.register(_tracked_name(segment), "shared_memory")
+    segment.unlink()
+
+
+def _is_exact_float(key: int) -> bool:
+    try:
+        return int(float(key)) == key
+    except OverflowError:
+        return False
+
+
+def _pack(keys: list) -> tuple[bytes, bytes]:
+    """
+    The key type code and the packed keys.
+    """
+    if all(type(key) is str for key in keys):
+        if keys:
+            encoded = [key.encode("utf-8") for key in keys]
+            offsets = array("Q", [0])
+            end = 0
+            for item in encoded:
+                end += len(item)
+                offsets.append(end)
+            return b"s", offsets.tobytes() + b"".join(encoded)
+    if all(type(key) is int for key in keys):
+        return b"q", array("q", keys).tobytes()
+    if all(type(key) in (int, float) for key in keys):
+        # Mixed with floats, ints are stored as floats, so they must fit.
+        if not all(type(key) is float or _is_exact_float(key)
+                   for key in keys):
+            raise TypeError("Int keys mixed with floats must be exactly "
+                            "representable as floats")
+        return b"d", array("d", keys).tobytes()
+    raise TypeError("Only int, float and str keys can be shared")
+
+
+class _Strings():
+    """
+    The UTF-8 encoded keys of a data segment as a sequence of bytes. UTF-8
+    sorts in code point order, so probes can be compared as bytes.
+    """
+
+    def __init__(self: S, offsets: memoryview, text: memoryview) -> None:
+        self.offsets = offsets
+        self.text = text
+
+    def __len__(self: S) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self: S, i: int) -> bytes:
+        return bytes(self.text[self.offsets[i]:self.offsets[i + 1]])
+
+
+class SharedTreeWriter():
+    """
+    Publishes the sorted keys of a tree into shared memory, where any
+    number of processes can read them with SharedTree.
+
+    Each publish writes a new data segment and then switches the version
+    number in the control segment, so readers move to the new keys
+    atomically. The previous version is kept until the next publish for
+    readers still attaching to it.
+    """
+
+    def __init__(self: W, name: Optional[str] = None) -> None:
+        self.name = name or "rbt_" + secrets.token_hex(6)
+        self._control = SharedMemory(self.name, create=True,
+                                     size=_CONTROL.size)
+        buf = self._control.buf
+        assert buf is not None
+        _CONTROL.pack_into(buf, 0, 0)
+        self.version = 0
+        self._segments: list[SharedMemory] = []
+        self._closed = False
+
+    def __enter__(self: W) -> W:
+        return self
+
+    def __exit__(self: W, *args: Any) -> None:
+        self.close()
+
+    def publish(self: W, source: Any) -> int:
+        """
+        Publish a RedBlackTree, or an iterable of sorted unique keys, and
+        return the new version. All keys must be ints, floats or strings.
+        """
+        if isinstance(source, RedBlackTree):
+            keys = [getattr(node, "key") for node in source.irange()]
+        else:
+            keys = list(source)
+        code, data = _pack(keys)
+        version = self.version + 1
+        segment = SharedMemory(_segment_name(self.name, version),
+                               create=True,
+                               size=_HEADER.size + max(len(data), 1))
+        buf = segment.buf
+        assert buf is not None
+        _HEADER.pack_into(buf, 0, code, len(keys))
+        buf[_HEADER.size:_HEADER.size + len(data)] = data
+
+        control = self._control.buf
+        assert control is not None
+        _CONTROL.pack_into(control, 0, version)
+        self.version = version
+        self._segments.append(segment)
+        while len(self._segments) > 2:
+            old = self._segments.pop(0)
+            old.close()
+            _unlink(old)
+        return version
+
+    def close(self: W) -> None:
+        """
+        Remove the published keys. Readers which are already attached can
+        still read the version they have.
+        """
+        if self._closed:
+            return
+        for segment in self._segments:
+            segment.close()
+            _unlink(segment)
+        self._segments = []
+        self._control.close()
+        _unlink(self._control)
+        self._closed = True
+
+
+class SharedTree():
+    """
+    A read-only sorted set served from shared memory published by a
+    SharedTreeWriter, without copying the keys into this process.
+
+    Each call first checks the control segment, and moves to the newest
+    version if the writer has published one.
+    """
+
+    def __init__(self: T, name: str) -> None:
+        self.name = name
+        self._control = _attach(name)
+        self.version = 0
+        self._segment: Optional[SharedMemory] = None
+        self._keys: Any = ()
+        self._code = b"q"
+        # Old segments which could not be closed while iterators used them.
+        self._retired: list[SharedMemory] = []
+        self.refresh()
+
+    # Dunder Methods
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self: T, *args: Any) -> None:
+        self.close()
+
+    def __len__(self: T) -> int:
+        self.refresh()
+        return len(self._keys)
+
+    def __contains__(self: T, key: Any) -> bool:
+        return self.search(key) is not None
+
+    def __iter__(self: T) -> Iterator:
+        return self.irange()
+
+    # Public Methods
+
+    def refresh(self: T) -> bool:
+        """
+        Move to the newest published version. Returns True if it changed.
+        """
+        control = self._control.buf
+        assert control is not None
+        while True:
+            (version,) = _CONTROL.unpack_from(control, 0)
+            if version == self.version:
+                return False
+            try:
+                segment = _attach(_segment_name(self.name, version))
+            except FileNotFoundError:
+                # The writer has already moved past this version.
+                continue
+            self._swap(version, segment)
+            return True
+
+    def search(self: T, key: Any) -> Any:
+        """
+        The stored key equal to key, or None.
+        """
+        self.refresh()
+        keys = self._keys
+        probe = self._probe(key)
+        i = bisect.bisect_left(keys, probe)
+        if i < len(keys) and keys[i] == probe:
+            return self._key(i)
+        return None
+
+    def ceiling(self: T, key: Any) -> Any:
+        """
+        The smallest key greater than or equal to key, or None.
+        """
+        self.refresh()
+        i = bisect.bisect_left(self._keys, self._probe(key))
+        return self._key(i) if i < len(self._keys) else None
+
+    def floor(self: T, key: Any) -> Any:
+        """
+        The largest key less than or equal to key, or None.
+        """
+        self.refresh()
+        i = bisect.bisect_right(self._keys, self._probe(key))
+        return self._key(i - 1) if i else None
+
+    def minimum(self: T) -> Any:
+        self.refresh()
+        return self._key(0) if len(self._keys) else None
+
+    def maximum(self: T) -> Any:
+        self.refresh()
+        return self._key(len(self._keys) - 1) if len(self._keys) else None
+
+    def irange(self: T, lo: Any = None, hi: Any = None,
+               inclusive: tuple[bool, bool] = (True, True),
+               reverse: bool = False) -> Iterator:
+        """
+        Lazily iterate over the keys between lo and hi, from the version
+        current when iteration starts.
+        """
+        self.refresh()
+        keys = self._keys
+        if lo is None:
+            start = 0
+        elif inclusive[0]:
+            start = bisect.bisect_left(keys, self._probe(lo))
+        else:
+            start = bisect.bisect_right(keys, self._probe(lo))
+        if hi is None:
+            stop = len(keys)
+        elif inclusive[1]:
+            stop = bisect.bisect_right(keys, self._probe(hi))
+        else:
+            stop = bisect.bisect_left(keys, self._probe(hi))
+        indices = range(start, stop)
+        return self._iterate(keys, reversed(indices) if reverse else indices)
+
+    def close(self: T) -> None:
+        self._release()
+        for segment in self._retired:
+            segment.close()
+        self._retired = []
+        self._control.close()
+
+    # Protected Methods
+
+    def _probe(self: T, key: Any) -> Any:
+        if self._code == b"s":
+            return key.encode("utf-8")
+        return key
+
+    def _key(self: T, i: int) -> Any:
+        if self._code == b"s":
+            return self._keys[i].decode("utf-8")
+        return self._keys[i]
+
+    def _iterate(self: T, keys: Any, indices: Iterable[int]) -> Iterator:
+        decode = self._code == b"s"
+        for i in indices:
+            yield keys[i].decode("utf-8") if decode else keys[i]
+
+    def _swap(self: T, version: int, segment: SharedMemory) -> None:
+        self._release()
+        buf = segment.buf
+        assert buf is not None
+        code, count = _HEADER.unpack_from(buf, 0)
+        body = buf[_HEADER.size:]
+        if code == b"s":
+            offsets = body[:8 * (count + 1)].cast("Q")
+            self._keys = _Strings(offsets, body[8 * (count + 1):])
+        else:
+            self._keys = body[:8 * count].cast(code.decode())
+        self._code = code
+        self._segment = segment
+        self.version = version
+
+    def _release(self: T) -> None:
+        """
+        Drop the current segment, closing it unless an iterator still has
+        its keys.
+        """
+        self._keys = ()
+        if self._segment is not None:
+            self._retired.append(self._segment)
+            self._segment = None
+        retired = []
+        for segment in self._retired:
+            try:
+                segment.close()
+            except BufferError:
+                retired.append(segment)
+        self._retired = retired
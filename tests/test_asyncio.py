@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from rbtree.rbtree import RedBlackTree
+
+
+def test_aiter_inorder() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([5, 3, 8, 1, 4])
+
+    async def collect() -> list:
+        return [node.key async for node in bst.aiter_inorder(chunk=2)]
+
+    assert asyncio.run(collect()) == [1, 3, 4, 5, 8]
+
+
+def test_airange() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(20))
+
+    async def collect() -> list:
+        return [n.key async for n in bst.airange(5, 9, reverse=True)]
+
+    assert asyncio.run(collect()) == [9, 8, 7, 6, 5]
+
+
+def test_yields_to_loop() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(10))
+    events = []
+
+    async def other() -> None:
+        events.append("other")
+
+    async def walk() -> None:
+        task = asyncio.create_task(other())
+        async for node in bst.aiter_inorder(chunk=3):
+            events.append(node.key)
+        await task
+
+    asyncio.run(walk())
+    assert events.index("other") == 3
+
+
+def test_concurrent_modification() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(10))
+
+    async def walk() -> None:
+        async for node in bst.aiter_inorder():
+            bst.insert(100)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(walk())
+
+
+def test_ainsert_many() -> None:
+    bst = RedBlackTree()
+
+    async def load() -> None:
+        await bst.ainsert_many(range(100), chunk=10)
+        await bst.adelete_many(range(50), chunk=10)
+
+    asyncio.run(load())
+    assert len(bst) == 50
+    assert bst.is_valid()
+
+
+def test_offload() -> None:
+    bst = RedBlackTree()
+
+    async def load() -> None:
+        with ThreadPoolExecutor(1) as executor:
+            await bst.ainsert_many(range(100), offload=10, executor=executor)
+        await bst.adelete_many(range(50), offload=10)
+
+    asyncio.run(load())
+    assert len(bst) == 50
+    assert bst.is_valid()
@@ -0,0 +1,64 @@
+import random
+import pytest
+from rbtree.augmentation import Augmentation
+from rbtree.rbtree import RedBlackTree
+
+
+def test_sum() -> None:
+    bst = RedBlackTree(Augmentation.sum())
+    for i in range(1, 11):
+        bst.insert(i)
+    assert bst.aggregate() == 55
+    assert bst.aggregate(3, 5) == 12
+    assert bst.aggregate(hi=4) == 10
+    assert bst.aggregate(lo=9) == 19
+
+
+def test_empty_range() -> None:
+    bst = RedBlackTree(Augmentation.sum())
+    assert bst.aggregate() is None
+    bst.insert(5)
+    assert bst.aggregate(6, 10, default=0) == 0
+
+
+def test_min_max() -> None:
+    low = RedBlackTree(Augmentation.min(lambda node: -node.key))
+    high = RedBlackTree(Augmentation.max())
+    for i in [5, 3, 8, 1, 9]:
+        low.insert(i)
+        high.insert(i)
+    assert low.aggregate(2, 8) == -8
+    assert high.aggregate(2, 8) == 8
+
+
+def test_order_preserved() -> None:
+    """
+    The combine function is only required to be associative
+    """
+    bst = RedBlackTree(Augmentation(lambda a, b: a + b, lambda n: str(n)))
+    for i in [4, 2, 6, 1, 3, 5, 7]:
+        bst.insert(i)
+    assert bst.aggregate() == "1234567"
+    assert bst.aggregate(2, 6) == "23456"
+
+
+def test_delete_updates() -> None:
+    random.seed(2)
+    bst = RedBlackTree(Augmentation.sum())
+    keys = list(range(100))
+    random.shuffle(keys)
+    for key in keys:
+        bst.insert(key)
+    live = set(keys)
+    for key in keys[:70]:
+        bst.delete(key)
+        live.remove(key)
+        assert bst.is_valid()
+        expected = sum(k for k in live if 20 <= k <= 80)
+        assert bst.aggregate(20, 80, 0) == expected
+
+
+def test_no_augmentation() -> None:
+    bst = RedBlackTree()
+    with pytest.raises(ValueError):
+        bst.aggregate()
@@ -0,0 +1,65 @@
+import heapq
+import random
+import pytest
+from rbtree.bounded import BoundedRedBlackTree
+
+
+def keys_of(bst: BoundedRedBlackTree) -> list:
+    return [node.key for node in bst.inorder()]
+
+
+def test_top_k() -> None:
+    random.seed(9)
+    stream = [random.randrange(10000) for _ in range(2000)]
+    bst = BoundedRedBlackTree(10)
+    bst.insert_many(stream)
+    assert len(bst) == 10
+    assert keys_of(bst) == sorted(heapq.nlargest(10, set(stream)))
+    assert bst.is_valid()
+    assert bst.evictions + bst.rejections + 10 <= len(stream)
+
+
+def test_evict_max() -> None:
+    bst = BoundedRedBlackTree(3, evict="max")
+    bst.insert_many([5, 1, 9, 3, 7, 0])
+    assert keys_of(bst) == [0, 1, 3]
+    assert bst.evictions == 2
+    assert bst.rejections == 1
+
+
+def test_counters() -> None:
+    bst = BoundedRedBlackTree(2)
+    bst.insert_many([1, 2])
+    bst.insert(0)
+    assert bst.rejections == 1
+    bst.insert(2)
+    assert bst.evictions == 0
+    bst.insert(3)
+    assert bst.evictions == 1
+    assert keys_of(bst) == [2, 3]
+    assert bst.peek_min().key == 2
+
+
+def test_lazy_delete() -> None:
+    bst = BoundedRedBlackTree(3, lazy_delete=True, compact_ratio=1.0)
+    bst.insert_many([1, 2, 3, 4, 5])
+    assert keys_of(bst) == [3, 4, 5]
+    assert bst.is_valid()
+
+
+def test_lazy_reinsert_minimum() -> None:
+    bst = BoundedRedBlackTree(3, lazy_delete=True)
+    bst.insert_many([5, 6, 7])
+    bst.delete(5)
+    bst.insert(5)
+    bst.insert(8)
+    bst.insert(9)
+    assert keys_of(bst) == [7, 8, 9]
+    assert bst.rejections == 0
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError):
+        BoundedRedBlackTree(0)
+    with pytest.raises(ValueError):
+        BoundedRedBlackTree(3, evict="middle")
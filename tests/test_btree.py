@@ -0,0 +1,95 @@
+import random
+import pytest
+from rbtree.btree import BTree
+
+
+def test_bad_fanout() -> None:
+    with pytest.raises(ValueError):
+        BTree(5)
+
+
+def test_insert() -> None:
+    tree = BTree(4)
+    for i in [5, 3, 8, 1, 4, 7, 9, 2, 6, 0]:
+        tree.insert(i)
+        assert tree.is_valid()
+    tree.insert(5)
+    assert len(tree) == 10
+    assert list(tree) == list(range(10))
+    assert tree.height() > 0
+
+
+def test_search() -> None:
+    tree = BTree(4)
+    assert tree.search(1) is None
+    for i in range(20):
+        tree.insert(i)
+    node = tree.search(13)
+    assert node is not None and 13 in node.keys
+    assert 13 in tree
+    assert 20 not in tree
+
+
+@pytest.mark.parametrize("fanout", [4, 6, 16])
+def test_random_delete(fanout: int) -> None:
+    random.seed(fanout)
+    tree = BTree(fanout)
+    keys = list(range(500))
+    random.shuffle(keys)
+    for key in keys:
+        tree.insert(key)
+    random.shuffle(keys)
+    for key in keys[:450]:
+        tree.delete(key)
+        assert tree.is_valid()
+    tree.delete(-1)
+    assert len(tree) == 50
+    assert list(tree) == sorted(keys[450:])
+
+
+def test_delete_all() -> None:
+    tree = BTree(4)
+    for i in range(100):
+        tree.insert(i)
+    for i in range(100):
+        tree.delete(i)
+    assert len(tree) == 0
+    assert tree.root.is_leaf()
+    assert tree.minimum() is None
+
+
+def test_navigation() -> None:
+    tree = BTree(4)
+    for i in range(0, 100, 2):
+        tree.insert(i)
+    assert tree.minimum() == 0
+    assert tree.maximum() == 98
+    assert tree.successor(40) == 42
+    assert tree.successor(41) == 42
+    assert tree.successor(98) is None
+    assert tree.predecessor(40) == 38
+    assert tree.predecessor(0) is None
+
+
+def test_irange() -> None:
+    tree = BTree(4)
+    for i in range(100):
+        tree.insert(i)
+    assert list(tree.irange(30, 40)) == list(range(30, 41))
+    assert list(tree.irange(30, 40, (False, False))) == list(range(31, 40))
+    assert list(tree.irange(hi=5)) == list(range(6))
+    assert list(tree.irange(95)) == list(range(95, 100))
+    assert list(tree.irange(30, 40, reverse=True)) == list(range(40, 29, -1))
+    assert list(tree.irange(30, 40, (False, False), True)) == list(
+        range(39, 30, -1)
+    )
+    assert list(tree.irange(reverse=True)) == list(range(99, -1, -1))
+    assert list(BTree().irange()) == []
+
+
+def test_fewer_nodes() -> None:
+    tree = BTree(64)
+    for i in range(10000):
+        tree.insert(i)
+    assert tree.node_count() * 10 < len(tree)
+    assert tree.height() <= 3
@@ -0,0 +1,70 @@
+import copy
+import pytest
+from rbtree.cache import LookupCache
+from rbtree.node import Node
+from rbtree.node_base import NodeBase
+from rbtree.rbtree import RedBlackTree
+
+
+def test_lru() -> None:
+    cache = LookupCache(2)
+    one = Node(1)
+    cache.put(1, one)
+    cache.put(2, Node(2))
+    assert cache.get(1) is one
+    cache.put(3, Node(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is one
+    assert len(cache) == 2
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+def test_bad_capacity() -> None:
+    with pytest.raises(ValueError):
+        LookupCache(0)
+
+
+def test_cached_search() -> None:
+    bst = RedBlackTree(cache_size=10)
+    bst.insert_many(range(20))
+    node = bst.search(5)
+    assert bst.search(5) is node
+    assert bst.cache is not None
+    assert bst.cache.stats()["hits"] == 1
+    assert bst.cache.hit_rate == 0.5
+
+
+def test_insert_invalidates_miss() -> None:
+    bst = RedBlackTree(cache_size=10)
+    assert bst.search(5).is_null()
+    bst.insert(5)
+    assert bst.search(5).key == 5
+
+
+def test_delete_invalidates() -> None:
+    bst = RedBlackTree(cache_size=10)
+    bst.insert_many(range(20))
+    assert bst.search(7).key == 7
+    assert bst.search(8).key == 8
+    bst.delete(7)
+    assert bst.search(7).is_null()
+    assert bst.cache is not None
+    assert len(bst.cache) == 2
+
+
+def test_unhashable() -> None:
+    bst = RedBlackTree(cache_size=10)
+    bst.insert([1])
+    assert bst.search([1]).key == [1]
+    assert bst.search(Node([1])).key == [1]
+
+
+def test_copy_has_own_cache() -> None:
+    bst = RedBlackTree(cache_size=10)
+    bst.insert_many(range(5))
+    bst.search(1)
+    clone = copy.copy(bst)
+    assert clone.cache is not bst.cache
+    assert clone.search(1) is not bst.search(1)
+    assert clone.search(9) is NodeBase.NIL
@@ -0,0 +1,44 @@
+from rbtree.cfb import CfbNameNode, cfb_sort_key
+from rbtree.rbtree import RedBlackTree
+
+
+def test_length_first() -> None:
+    assert cfb_sort_key("Z") < cfb_sort_key("AA")
+    assert cfb_sort_key("bb") < cfb_sort_key("aaa")
+
+
+def test_case_insensitive() -> None:
+    assert cfb_sort_key("abc") == cfb_sort_key("ABC")
+    assert cfb_sort_key("abc") < cfb_sort_key("ABD")
+    assert cfb_sort_key("été") == cfb_sort_key("ÉTÉ")
+
+
+def test_expanding_uppercase() -> None:
+    """
+    Characters whose uppercase is longer are compared unchanged
+    """
+    assert len(cfb_sort_key("ß")) == 4
+
+
+def test_length_in_code_units() -> None:
+    # One character outside the BMP is two UTF-16 code units.
+    assert cfb_sort_key("\U0001F600") > cfb_sort_key("z")
+    assert cfb_sort_key("\U0001F600")[:2] == b"\x00\x02"
+
+
+def test_interned() -> None:
+    assert cfb_sort_key("Root Entry") is cfb_sort_key("Root Entry")
+
+
+def test_tree() -> None:
+    bst = RedBlackTree()
+    for name in ["Root Entry", "WordDocument", "1Table", "Data", "data2"]:
+        bst.insert(CfbNameNode(name))
+    assert bst.is_valid()
+    assert [str(node) for node in bst.inorder()] == [
+        "Data", "data2", "1Table", "Root Entry", "WordDocument"
+    ]
+    bst.insert(CfbNameNode("DATA"))
+    assert len(bst) == 5
+    assert bst.search(cfb_sort_key("DATA")).name == "Data"
+    assert bst.search(CfbNameNode("wORDdOCUMENT")).name == "WordDocument"
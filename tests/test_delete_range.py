@@ -0,0 +1,69 @@
+import random
+import pytest
+from rbtree.augmentation import Augmentation
+from rbtree.rbtree import DELETE, RedBlackTree
+
+
+def keys(bst: RedBlackTree) -> list:
+    return [node.key for node in bst.inorder()]
+
+
+@pytest.mark.parametrize("lo,hi", [(40, 45), (10, 90), (None, 50),
+                                   (50, None), (None, None), (200, 300)])
+def test_delete_range(lo: int, hi: int) -> None:
+    random.seed(7)
+    bst = RedBlackTree(Augmentation.sum())
+    values = list(range(100))
+    random.shuffle(values)
+    bst.insert_many(values)
+    expected = [k for k in range(100)
+                if (lo is not None and k < lo) or (hi is not None and k > hi)]
+    removed = bst.delete_range(lo, hi)
+    assert removed == 100 - len(expected)
+    assert keys(bst) == expected
+    assert len(bst) == len(expected)
+    assert bst.is_valid()
+    assert bst.aggregate(default=0) == sum(expected)
+    if expected:
+        assert bst.minimum().key == expected[0]
+        assert bst.maximum().key == expected[-1]
+
+
+def test_exclusive_bounds() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(10))
+    assert bst.delete_range(2, 7, (False, False)) == 4
+    assert keys(bst) == [0, 1, 2, 7, 8, 9]
+
+
+def test_truncate() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(100))
+    assert bst.truncate_below(20) == 20
+    assert bst.truncate_above(80, inclusive=True) == 20
+    assert keys(bst) == list(range(20, 80))
+    assert bst.is_valid()
+
+
+def test_delete_range_lazy() -> None:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=0.9)
+    bst.insert_many(range(100))
+    bst.delete(50)
+    assert bst.delete_range(40, 60) == 20
+    assert len(bst) == 79
+    assert bst.search(45).is_null()
+    assert bst.is_valid()
+    assert bst.delete_range(hi=95) == 75
+    assert keys(bst) == [96, 97, 98, 99]
+    assert bst.tombstones == 0
+
+
+def test_delete_range_notifies() -> None:
+    bst = RedBlackTree(cache_size=10)
+    bst.insert_many(range(10))
+    assert bst.search(1).key == 1
+    events: list = []
+    bst.subscribe(lambda op, node: events.append((op, node.key)))
+    bst.truncate_below(8)
+    assert events == [(DELETE, k) for k in range(8)]
+    assert bst.search(1).is_null()
@@ -0,0 +1,99 @@
+import os
+import time
+from pathlib import Path
+from rbtree.durable import Durability, DurableRedBlackTree
+
+
+def keys(tree: DurableRedBlackTree) -> list:
+    return [node.key for node in tree.tree.inorder()]
+
+
+def test_replay(tmp_path: Path) -> None:
+    with DurableRedBlackTree(str(tmp_path)) as tree:
+        for i in range(10):
+            tree.insert(i)
+        tree.delete(3)
+    with DurableRedBlackTree(str(tmp_path)) as tree:
+        assert len(tree) == 9
+        assert tree.search(3).is_null()
+        assert tree.tree.is_valid()
+
+
+def test_checkpoint(tmp_path: Path) -> None:
+    with DurableRedBlackTree(str(tmp_path), checkpoint_interval=5) as tree:
+        for i in range(12):
+            tree.insert(i)
+    assert os.path.exists(tmp_path / "snapshot.pickle")
+    # Only the operations since the last checkpoint are in the log.
+    with DurableRedBlackTree(str(tmp_path), checkpoint_interval=5) as tree:
+        assert keys(tree) == list(range(12))
+        assert tree._sequence == 12
+
+
+def test_crash_after_snapshot(tmp_path: Path) -> None:
+    """
+    Log records already in the snapshot are not replayed twice.
+    """
+    tree = DurableRedBlackTree(str(tmp_path), Durability.SYNC)
+    for i in range(5):
+        tree.insert(i)
+    tree.sync()
+    with open(tmp_path / "wal.log", "rb") as log:
+        saved_log = log.read()
+    tree.delete(2)
+    tree.checkpoint()
+    tree.close()
+    with open(tmp_path / "wal.log", "wb") as log:
+        log.write(saved_log)
+    with DurableRedBlackTree(str(tmp_path)) as tree:
+        assert keys(tree) == [0, 1, 3, 4]
+
+
+def test_torn_write(tmp_path: Path) -> None:
+    with DurableRedBlackTree(str(tmp_path), Durability.SYNC) as tree:
+        tree.insert(1)
+        tree.insert(2)
+    size = os.path.getsize(tmp_path / "wal.log")
+    with open(tmp_path / "wal.log", "r+b") as log:
+        log.truncate(size - 3)
+    with DurableRedBlackTree(str(tmp_path)) as tree:
+        assert keys(tree) == [1]
+        tree.insert(5)
+    with DurableRedBlackTree(str(tmp_path)) as tree:
+        assert keys(tree) == [1, 5]
+
+
+def test_group_commit(tmp_path: Path) -> None:
+    tree = DurableRedBlackTree(str(tmp_path), group_size=10, group_delay=60)
+    for i in range(5):
+        tree.insert(i)
+    assert os.path.getsize(tmp_path / "wal.log") == 0
+    tree.sync()
+    assert os.path.getsize(tmp_path / "wal.log") > 0
+    tree.close()
+
+
+def test_group_delay(tmp_path: Path) -> None:
+    """
+    A group which never fills is still written once it has waited.
+    """
+    tree = DurableRedBlackTree(str(tmp_path), group_delay=0.05)
+    tree.insert(1)
+    deadline = time.monotonic() + 5
+    while (os.path.getsize(tmp_path / "wal.log") == 0
+           and time.monotonic() < deadline):
+        time.sleep(0.01)
+    # Recover without closing the first tree, as after a crash.
+    with DurableRedBlackTree(str(tmp_path)) as recovered:
+        assert keys(recovered) == [1]
+    tree.close()
+
+
+def test_options(tmp_path: Path) -> None:
+    with DurableRedBlackTree(str(tmp_path), Durability.NONE,
+                             lazy_delete=True) as tree:
+        tree.insert(1)
+        tree.insert(2)
+        tree.delete(1)
+        assert tree.tree.tombstones == 1
+        assert [node.key for node in tree] == [2]
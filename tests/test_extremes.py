@@ -0,0 +1,124 @@
+import pickle
+import random
+from rbtree.node_base import NodeBase
+from rbtree.rbtree import RedBlackTree
+
+
+def check_extremes(bst: RedBlackTree) -> None:
+    keys = [node.key for node in bst.inorder()]
+    if keys:
+        assert bst._min_node.key == keys[0]
+        assert bst._max_node.key == keys[-1]
+    else:
+        assert bst._min_node is NodeBase.NIL
+
+
+def test_cached_extremes() -> None:
+    random.seed(5)
+    bst = RedBlackTree()
+    keys = list(range(100))
+    random.shuffle(keys)
+    for key in keys:
+        bst.insert(key)
+        check_extremes(bst)
+    random.shuffle(keys)
+    for key in keys:
+        bst.delete(key)
+        check_extremes(bst)
+
+
+def test_pop() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([5, 1, 9, 3, 7])
+    assert bst.peek_min().key == 1
+    assert bst.peek_max().key == 9
+    assert bst.pop_min().key == 1
+    assert bst.pop_max().key == 9
+    assert bst.pop_min().key == 3
+    assert len(bst) == 2
+    assert bst.is_valid()
+    assert [node.key for node in bst.inorder()] == [5, 7]
+
+
+def test_pop_empty() -> None:
+    bst = RedBlackTree()
+    assert bst.pop_min().is_null()
+    assert bst.pop_max().is_null()
+    assert bst.peek_min().is_null()
+
+
+def test_priority_queue() -> None:
+    random.seed(6)
+    bst = RedBlackTree()
+    keys = random.sample(range(1000), 200)
+    bst.insert_many(keys)
+    popped = [bst.pop_min().key for _ in range(100)]
+    popped += [bst.pop_max().key for _ in range(100)]
+    ordered = sorted(keys)
+    assert popped == ordered[:100] + ordered[:99:-1]
+    assert len(bst) == 0
+
+
+def test_lazy_pop() -> None:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=0.9)
+    bst.insert_many(range(10))
+    assert bst.pop_min().key == 0
+    assert bst.pop_min().key == 1
+    assert bst.tombstones == 2
+    assert bst.peek_min().key == 2
+    bst.compact()
+    check_extremes(bst)
+
+
+def test_extremes_after_pickle() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(10))
+    clone = pickle.loads(pickle.dumps(bst))
+    check_extremes(clone)
+    assert clone.pop_max().key == 9
+
+
+def test_revived_extremes() -> None:
+    """
+    Reinserting a key over a tombstone at either end replaces the cached
+    extreme node.
+    """
+    bst = RedBlackTree(lazy_delete=True)
+    bst.insert_many(range(1, 9))
+    bst.delete(1)
+    bst.delete(8)
+    bst.insert(1)
+    bst.insert(8)
+    check_extremes(bst)
+    assert bst.minimum().key == 1
+    assert bst.maximum().key == 8
+    assert bst.pop_min().key == 1
+    assert bst.peek_max().key == 8
+
+
+def test_lazy_extremes_skip_tombstones() -> None:
+    """
+    Lazily deleted extremes move the cached nodes on to live neighbours,
+    so popping every node in lazy mode stays linear.
+    """
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=1.0)
+    bst.insert_many(range(4000))
+    for i in range(2000):
+        assert bst.pop_min().key == i
+        assert bst.pop_max().key == 3999 - i
+        assert not bst._min_node.is_deleted()
+        assert not bst._max_node.is_deleted()
+    assert bst.tombstones == 4000
+    assert bst.minimum().is_null()
+    assert bst.maximum().is_null()
+    bst.insert(5)
+    check_extremes(bst)
+    bst.insert(3)
+    bst.insert(7)
+    check_extremes(bst)
+    bst.insert(-1)
+    bst.insert(5000)
+    check_extremes(bst)
+    clone = pickle.loads(pickle.dumps(bst))
+    check_extremes(clone)
+    assert clone.pop_min().key == -1
@@ -0,0 +1,75 @@
+import pickle
+import pytest
+from rbtree.augmentation import Augmentation
+from rbtree.frozen import FrozenTree
+from rbtree.node import Node
+from rbtree.rbtree import RedBlackTree
+
+
+def frozen(n: int) -> FrozenTree:
+    bst = RedBlackTree()
+    bst.insert_many(range(0, 2 * n, 2))
+    return bst.freeze()
+
+
+def test_search() -> None:
+    for n in range(0, 40):
+        tree = frozen(n)
+        assert len(tree) == n
+        for i in range(-1, 2 * n + 1):
+            assert (i in tree) == (i % 2 == 0 and 0 <= i < 2 * n)
+
+
+def test_floor_ceiling() -> None:
+    tree = frozen(10)
+    assert tree.floor(5) == 4
+    assert tree.floor(4) == 4
+    assert tree.floor(-1) is None
+    assert tree.ceiling(5) == 6
+    assert tree.ceiling(6) == 6
+    assert tree.ceiling(19) is None
+    assert tree.minimum() == 0
+    assert tree.maximum() == 18
+
+
+def test_irange() -> None:
+    tree = frozen(10)
+    assert list(tree) == list(range(0, 20, 2))
+    assert list(tree.irange(3, 9)) == [4, 6, 8]
+    assert list(tree.irange(4, 8, (False, True))) == [6, 8]
+    assert list(tree.irange(hi=4, reverse=True)) == [4, 2, 0]
+
+
+def test_immutable() -> None:
+    tree = frozen(3)
+    with pytest.raises(AttributeError):
+        tree._sorted = ()
+
+
+def test_thaw() -> None:
+    tree = frozen(50)
+    bst = tree.thaw(augmentation=Augmentation.sum())
+    assert bst.is_valid()
+    assert len(bst) == 50
+    assert bst.aggregate(0, 10) == 30
+    bst.insert(1)
+    assert 1 not in tree
+
+
+def test_custom_nodes() -> None:
+    class Reversed(Node):
+        def __lt__(self: 'Reversed', other: object) -> bool:
+            return other.key < self.key  # type: ignore
+
+    bst = RedBlackTree()
+    for i in range(5):
+        bst.insert(Reversed(i))
+    tree = bst.freeze()
+    assert [node.key for node in tree] == [4, 3, 2, 1, 0]
+    assert tree.search(Reversed(3)).key == 3
+    assert tree.thaw().is_valid()
+
+
+def test_pickle() -> None:
+    tree = pickle.loads(pickle.dumps(frozen(5)))
+    assert list(tree) == [0, 2, 4, 6, 8]
@@ -0,0 +1,109 @@
+import copy
+import pickle
+import random
+from rbtree.cfb import CfbNameNode, cfb_sort_key
+from rbtree.node import Node
+from rbtree.rbtree import RedBlackTree
+
+
+def check_index(bst: RedBlackTree) -> None:
+    live = bst.inorder()
+    assert bst._index == {node.key: node for node in live}
+    assert bst._unindexed == 0
+
+
+def test_search() -> None:
+    bst = RedBlackTree(hash_index=True)
+    bst.insert_many([5, 1, 9])
+    assert bst.search(5).key == 5
+    assert bst.search(Node(9)).key == 9
+    assert bst.search(4).is_null()
+    assert 1 in bst
+    assert 2 not in bst
+    bst.delete(5)
+    assert 5 not in bst
+    check_index(bst)
+
+
+def test_bulk_paths() -> None:
+    random.seed(4)
+    bst = RedBlackTree(hash_index=True)
+    bst.insert_many(random.sample(range(1000), 300))
+    bst.delete_range(100, 200)
+    check_index(bst)
+    bst.truncate_below(900)
+    check_index(bst)
+    bst.pop_min()
+    bst.pop_max()
+    check_index(bst)
+    check_index(bst.freeze().thaw(hash_index=True))
+
+
+def test_lazy_delete() -> None:
+    bst = RedBlackTree(hash_index=True, lazy_delete=True)
+    bst.insert_many(range(10))
+    bst.delete(3)
+    assert 3 not in bst
+    check_index(bst)
+    bst.insert(3)
+    assert 3 in bst
+    check_index(bst)
+    bst.delete_many(range(8))
+    check_index(bst)
+
+
+def test_copies() -> None:
+    bst = RedBlackTree(hash_index=True)
+    bst.insert_many(range(20))
+    for other in [pickle.loads(pickle.dumps(bst)), copy.copy(bst),
+                  copy.deepcopy(bst)]:
+        check_index(other)
+        assert other.search(7) is not bst.search(7)
+
+
+def test_unindexed_nodes() -> None:
+    bst = RedBlackTree(hash_index=True)
+    bst.insert(Node([1]))
+    bst.insert(Node([2]))
+    assert bst._unindexed == 2
+    assert bst.search([2]).key == [2]
+    bst.delete([2])
+    assert bst._unindexed == 1
+
+
+def test_custom_nodes() -> None:
+    bst = RedBlackTree(hash_index=True)
+    bst.insert(CfbNameNode("WordDocument"))
+    assert bst.search(cfb_sort_key("WORDDOCUMENT")).name == "WordDocument"
+
+
+class CaseInsensitiveNode(Node):
+    def __eq__(self: 'CaseInsensitiveNode', other: object) -> bool:
+        if not isinstance(other, CaseInsensitiveNode):
+            return NotImplemented
+        return bool(self.key.lower() == other.key.lower())
+
+    def __lt__(self: 'CaseInsensitiveNode', other: Node) -> bool:
+        return bool(self.key.lower() < other.key.lower())
+
+
+def test_node_subclasses() -> None:
+    bst = RedBlackTree(hash_index=True)
+    bst.insert(CaseInsensitiveNode("Foo"))
+    bst.insert(CaseInsensitiveNode("bar"))
+    assert bst._unindexed == 2
+    assert bst.search(CaseInsensitiveNode("foo")).key == "Foo"
+    assert bst.search(CaseInsensitiveNode("BAR")).key == "bar"
+    bst.delete(bst.search(CaseInsensitiveNode("FOO")))
+    assert bst._unindexed == 1
+    assert bst.search(CaseInsensitiveNode("foo")).is_null()
+
+
+def test_memory_usage() -> None:
+    plain = RedBlackTree()
+    indexed = RedBlackTree(hash_index=True)
+    plain.insert_many(range(1000))
+    indexed.insert_many(range(1000))
+    extra = (indexed.memory_usage()["auxiliary"]
+             - plain.memory_usage()["auxiliary"])
+    assert extra > 1000 * 8
@@ -0,0 +1,126 @@
+import random
+from rbtree.augmentation import Augmentation
+from rbtree.node import Node
+from rbtree.rbtree import RedBlackTree
+
+
+def lazy_tree(n: int) -> RedBlackTree:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=0.9)
+    bst.insert_many(range(n))
+    return bst
+
+
+def test_tombstone() -> None:
+    bst = lazy_tree(10)
+    root = bst.root
+    bst.delete(root.key)
+    assert bst.root is root
+    assert root.is_deleted()
+    assert len(bst) == 9
+    assert bst.tombstones == 1
+    assert bst.search(root.key).is_null()
+    assert root.key not in [node.key for node in bst.inorder()]
+    assert root not in list(bst.irange())
+
+
+def test_delete_twice() -> None:
+    bst = lazy_tree(10)
+    bst.delete(4)
+    bst.delete(4)
+    assert len(bst) == 9
+    assert bst.tombstones == 1
+
+
+def test_min_max_skip_tombstones() -> None:
+    bst = lazy_tree(10)
+    bst.delete(0)
+    bst.delete(1)
+    bst.delete(9)
+    assert bst.minimum().key == 2
+    assert bst.maximum().key == 8
+    assert bst.successor(bst.search(5)).key == 6
+    bst.delete(6)
+    assert bst.successor(bst.search(5)).key == 7
+    assert bst.predecessor(bst.search(7)).key == 5
+
+
+def test_reinsert() -> None:
+    bst = lazy_tree(10)
+    bst.delete(3)
+    node = Node(3)
+    bst.insert(node)
+    assert bst.search(3) is node
+    assert len(bst) == 10
+    assert bst.tombstones == 0
+    assert bst.is_valid()
+    assert [n.key for n in bst.inorder()] == list(range(10))
+
+
+def test_reinsert_tombstone_node() -> None:
+    """
+    A node which was lazily deleted is live again when it is inserted,
+    into another tree or into the same tree after compaction.
+    """
+    bst = lazy_tree(10)
+    node = bst.pop_min()
+    other = RedBlackTree()
+    other.insert(node)
+    assert len(other) == 1
+    assert other.search(0) is node
+    assert other.minimum() is node
+
+    bst = lazy_tree(10)
+    node = bst.search(3)
+    bst.delete(3)
+    bst.compact()
+    bst.insert(node)
+    assert bst.search(3) is node
+    assert len(bst) == 10
+    assert bst.tombstones == 0
+    assert [n.key for n in bst.inorder()] == list(range(10))
+
+
+def test_compact() -> None:
+    bst = lazy_tree(100)
+    for i in range(0, 100, 2):
+        bst.delete(i)
+    assert bst.tombstones == 50
+    bst.compact()
+    assert bst.tombstones == 0
+    assert len(bst) == 50
+    assert len(bst.inorder()) == 50
+    assert bst.is_valid()
+
+
+def test_automatic_compact() -> None:
+    bst = RedBlackTree(lazy_delete=True)
+    bst.insert_many(range(10))
+    for i in range(5):
+        bst.delete(i)
+    assert bst.tombstones == 5
+    bst.delete(5)
+    assert bst.tombstones == 0
+    assert len(bst) == 4
+    assert bst.is_valid()
+
+
+def test_rebuild_is_valid() -> None:
+    for n in range(1, 70):
+        bst = RedBlackTree()
+        bst._rebuild([Node(i) for i in range(n)])
+        assert len(bst) == n
+        assert bst.is_valid()
+
+
+def test_aggregate_skips_tombstones() -> None:
+    random.seed(3)
+    bst = RedBlackTree(Augmentation.sum(), lazy_delete=True)
+    keys = list(range(50))
+    bst.insert_many(keys)
+    random.shuffle(keys)
+    live = set(keys)
+    for key in keys[:40]:
+        bst.delete(key)
+        live.remove(key)
+        expected = sum(k for k in live if 10 <= k <= 40)
+        assert bst.aggregate(10, 40, 0) == expected
@@ -0,0 +1,89 @@
+import random
+import sys
+from rbtree.llrb import LeftLeaningRedBlackTree, LLRBNode
+from rbtree.node import Node
+
+
+def test_insert() -> None:
+    tree = LeftLeaningRedBlackTree()
+    for i in [5, 3, 8, 1, 4, 7, 9, 2, 6]:
+        tree.insert(i)
+        assert tree.is_valid()
+    tree.insert(5)
+    assert len(tree) == 9
+    assert list(tree) == list(range(1, 10))
+
+
+def test_search() -> None:
+    tree = LeftLeaningRedBlackTree()
+    assert tree.search(1) is None
+    tree.insert(1)
+    node = tree.search(1)
+    assert node is not None and node.key == 1
+    assert 1 in tree
+    assert 2 not in tree
+
+
+def test_random_delete() -> None:
+    random.seed(4)
+    tree = LeftLeaningRedBlackTree()
+    keys = list(range(300))
+    random.shuffle(keys)
+    for key in keys:
+        tree.insert(key)
+    random.shuffle(keys)
+    for key in keys[:250]:
+        tree.delete(key)
+        assert tree.is_valid()
+    tree.delete(-1)
+    assert len(tree) == 50
+    assert list(tree) == sorted(keys[250:])
+
+
+def test_delete_all() -> None:
+    tree = LeftLeaningRedBlackTree()
+    for i in range(10):
+        tree.insert(i)
+    for i in range(10):
+        tree.delete(i)
+    assert tree.root is None
+    assert len(tree) == 0
+
+
+def test_navigation() -> None:
+    tree = LeftLeaningRedBlackTree()
+    assert tree.minimum() is None
+    for i in range(0, 20, 2):
+        tree.insert(i)
+    assert tree.minimum().key == 0
+    assert tree.maximum().key == 18
+    assert tree.successor(4).key == 6
+    assert tree.successor(5).key == 6
+    assert tree.successor(18) is None
+    assert tree.predecessor(4).key == 2
+    assert tree.predecessor(0) is None
+
+
+def test_traversals() -> None:
+    tree = LeftLeaningRedBlackTree()
+    for i in [2, 1, 3]:
+        tree.insert(i)
+    assert [n.key for n in tree.preorder()] == [2, 1, 3]
+    assert [n.key for n in tree.inorder()] == [1, 2, 3]
+    assert [n.key for n in tree.postorder()] == [1, 3, 2]
+
+
+def test_irange() -> None:
+    tree = LeftLeaningRedBlackTree()
+    for i in range(10):
+        tree.insert(i)
+    assert [n.key for n in tree.irange(3, 6)] == [3, 4, 5, 6]
+    assert [n.key for n in tree.irange(3, 6, (False, False))] == [4, 5]
+    assert [n.key for n in tree.irange(hi=2, reverse=True)] == [2, 1, 0]
+
+
+def test_smaller_nodes() -> None:
+    node = Node(1)
+    full = sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+    compact = sys.getsizeof(LLRBNode(1))
+    assert compact * 3 <= full * 2
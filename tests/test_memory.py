@@ -0,0 +1,65 @@
+import sys
+import tracemalloc
+from rbtree.memory import deep_sizeof, node_memory_usage
+from rbtree.node import Node
+from rbtree.rbtree import RedBlackTree
+
+# Generous per-node budget, to catch a node layout regression.
+BYTES_PER_NODE = 600
+
+
+def test_node_breakdown() -> None:
+    node = Node(5)
+    usage = node_memory_usage(node)
+    assert usage["object"] == sys.getsizeof(node)
+    assert usage["__dict__"] == sys.getsizeof(node.__dict__)
+    assert usage["attributes"]["_key"] == sys.getsizeof(5)
+    assert "parent" not in usage["attributes"]
+
+
+def test_memory_usage() -> None:
+    bst = RedBlackTree()
+    empty = bst.memory_usage()
+    assert empty["nodes"] == 0
+    assert empty["per_node"] is None
+    bst.insert_many(str(i) * 10 for i in range(100))
+    shallow = bst.memory_usage()
+    deep = bst.memory_usage(deep=True)
+    assert shallow["count"] == 100
+    assert shallow["keys"] == 0
+    assert deep["keys"] >= 100 * sys.getsizeof("0" * 10)
+    assert deep["total"] == deep["nodes"] + deep["keys"] + deep["auxiliary"]
+    assert shallow["nodes"] == 100 * (
+        shallow["per_node"]["object"] + shallow["per_node"]["__dict__"]
+    )
+
+
+def test_cache_counted() -> None:
+    bst = RedBlackTree(cache_size=100)
+    bst.insert_many(range(10))
+    before = bst.memory_usage()["auxiliary"]
+    for i in range(10):
+        bst.search(i)
+    assert bst.memory_usage()["auxiliary"] > before
+
+
+def test_deep_sizeof() -> None:
+    seen: set = set()
+    value = [1000, 2000]
+    assert deep_sizeof(value, seen) == (
+        sys.getsizeof(value) + 2 * sys.getsizeof(1000)
+    )
+    assert deep_sizeof(value, seen) == 0
+
+
+def test_node_layout_budget() -> None:
+    n = 2000
+    tracemalloc.start()
+    try:
+        bst = RedBlackTree()
+        start, _ = tracemalloc.get_traced_memory()
+        bst.insert_many(range(1000, 1000 + n))
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert (current - start) / n < BYTES_PER_NODE
@@ -0,0 +1,35 @@
+import itertools
+import rbtree
+from rbtree.rbtree import RedBlackTree
+
+
+def make_tree(keys: list) -> RedBlackTree:
+    bst = RedBlackTree()
+    bst.insert_many(keys)
+    return bst
+
+
+def test_merge() -> None:
+    trees = [make_tree([1, 5, 9]), make_tree([2, 5, 8]), make_tree([])]
+    keys = [node.key for node in rbtree.merge(*trees)]
+    assert keys == [1, 2, 5, 5, 8, 9]
+
+
+def test_reverse_dedupe() -> None:
+    trees = [make_tree([1, 5, 9]), make_tree([2, 5, 8])]
+    merged = rbtree.merge(*trees, reverse=True, dedupe=True)
+    assert [node.key for node in merged] == [9, 8, 5, 2, 1]
+
+
+def test_dedupe_keeps_first_tree() -> None:
+    first = make_tree([3])
+    second = make_tree([3])
+    [node] = list(rbtree.merge(first, second, dedupe=True))
+    assert node is first.search(3)
+
+
+def test_lazy() -> None:
+    trees = [make_tree(range(i, 10000, 4)) for i in range(4)]
+    merged = rbtree.merge(*trees)
+    top = [node.key for node in itertools.islice(merged, 5)]
+    assert top == [0, 1, 2, 3, 4]
@@ -0,0 +1,52 @@
+import random
+from rbtree.rbtree import RedBlackTree
+
+
+def keys_of(nodes: list) -> list:
+    return [node.key for node in nodes]
+
+
+def test_nearest() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([1, 4, 9, 16, 25])
+    assert keys_of(bst.nearest(10)) == [9]
+    assert keys_of(bst.nearest(10, 3)) == [9, 4, 16]
+    assert keys_of(bst.nearest(16, 2)) == [16, 9]
+    assert keys_of(bst.nearest(100, 2)) == [25, 16]
+    assert keys_of(bst.nearest(-5, 10)) == [1, 4, 9, 16, 25]
+
+
+def test_ties_prefer_smaller() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([2, 6])
+    assert keys_of(bst.nearest(4, 2)) == [2, 6]
+
+
+def test_empty() -> None:
+    assert RedBlackTree().nearest(3, 2) == []
+
+
+def test_distance() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([1.0, 2.0, 8.0])
+    nodes = bst.nearest(4.0, 2, distance=lambda a, b: (a - b) ** 2)
+    assert keys_of(nodes) == [2.0, 1.0]
+
+
+def test_skips_tombstones() -> None:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=1.0)
+    bst.insert_many(range(10))
+    bst.delete(5)
+    bst.delete(4)
+    assert keys_of(bst.nearest(5, 3)) == [6, 3, 7]
+
+
+def test_random() -> None:
+    random.seed(7)
+    keys = random.sample(range(1000), 200)
+    bst = RedBlackTree()
+    bst.insert_many(keys)
+    for _ in range(50):
+        x = random.uniform(-10, 1010)
+        expected = sorted(keys, key=lambda key: (abs(x - key), key))[:7]
+        assert keys_of(bst.nearest(x, 7)) == expected
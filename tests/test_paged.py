@@ -0,0 +1,98 @@
+import os
+import random
+import pytest
+from rbtree.paged import PagedRedBlackTree
+
+
+def test_insert_delete(tmp_path: str) -> None:
+    random.seed(3)
+    path = os.path.join(tmp_path, "tree.pages")
+    keys = random.sample(range(100000), 2000)
+    with PagedRedBlackTree(path, page_size=512, pool_size=4) as bst:
+        for key in keys:
+            bst.insert(key)
+        assert bst.is_valid()
+        assert len(bst) == 2000
+        assert list(bst) == sorted(keys)
+        random.shuffle(keys)
+        for key in keys[:1500]:
+            bst.delete(key)
+        assert bst.is_valid()
+        assert list(bst) == sorted(keys[1500:])
+        assert bst.pool.misses > 0
+        assert bst.pool.writes > 0
+        assert len(bst.pool) == 4
+
+
+def test_search_and_range(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "tree.pages")
+    with PagedRedBlackTree(path) as bst:
+        for key in [5, 1, 9, 3, 7, 3]:
+            bst.insert(key)
+        assert len(bst) == 5
+        assert bst.search(7) == 7
+        assert bst.search(4) is None
+        assert 9 in bst
+        assert bst.minimum() == 1
+        assert bst.maximum() == 9
+        assert list(bst.irange(3, 7, (False, True))) == [5, 7]
+        assert list(bst.irange(hi=5, reverse=True)) == [5, 3, 1]
+        bst.pool.reset_stats()
+        bst.search(7)
+        assert bst.pool.hits > 0
+        assert bst.pool.stats()["hit_rate"] == 1.0
+
+
+def test_reopen(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "tree.pages")
+    with PagedRedBlackTree(path, pool_size=2) as bst:
+        for key in range(1000):
+            bst.insert(key)
+        for key in range(0, 1000, 2):
+            bst.delete(key)
+    with PagedRedBlackTree(path) as bst:
+        assert len(bst) == 500
+        assert bst.is_valid()
+        assert list(bst) == list(range(1, 1000, 2))
+        # Freed records are reused.
+        before = os.path.getsize(path)
+        for key in range(0, 1000, 2):
+            bst.insert(key)
+        bst.flush()
+        assert os.path.getsize(path) == before
+        assert bst.is_valid()
+
+
+def test_bytes_keys(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "tree.pages")
+    with PagedRedBlackTree(path, key_format="8s") as bst:
+        for key in [b"pear", b"apple", b"fig"]:
+            bst.insert(key)
+        assert list(bst) == [b"apple", b"fig", b"pear"]
+        assert bst.search(b"fig") == b"fig"
+
+
+def test_bytes_keys_must_fit(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "tree.pages")
+    with PagedRedBlackTree(path, key_format="4s") as bst:
+        bst.insert(b"abcd")
+        for key in [b"abcdef", b"abcdzz", b"ab\0"]:
+            with pytest.raises(ValueError):
+                bst.insert(key)
+            with pytest.raises(ValueError):
+                bst.search(key)
+            with pytest.raises(ValueError):
+                bst.delete(key)
+        assert len(bst) == 1
+        assert list(bst) == [b"abcd"]
+
+
+def test_mismatched_file(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "tree.pages")
+    PagedRedBlackTree(path).close()
+    with pytest.raises(ValueError):
+        PagedRedBlackTree(path, key_format="d")
+    with open(path, "wb") as f:
+        f.write(b"not a tree")
+    with pytest.raises(ValueError):
+        PagedRedBlackTree(path)
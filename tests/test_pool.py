@@ -0,0 +1,127 @@
+import gc
+import random
+from rbtree.node import Node, PooledNode
+from rbtree.rbtree import RedBlackTree
+
+
+def test_recycles_deleted_nodes() -> None:
+    bst = RedBlackTree(pool_size=2)
+    bst.insert_many([1, 2, 3])
+    node = bst.search(2)
+    assert type(node) is PooledNode
+    bst.delete(2)
+    assert bst._pool == [node]
+    assert node.key is None
+    bst.insert(7)
+    assert bst.search(7) is node
+    assert bst._pool == []
+    assert bst.is_valid()
+
+
+def test_pool_size_limit() -> None:
+    bst = RedBlackTree(pool_size=2)
+    bst.insert_many(range(10))
+    bst.delete_many(range(5))
+    assert len(bst._pool) == 2
+    bst.delete_range(5, 8)
+    assert len(bst._pool) == 2
+
+
+def test_duplicate_insert_recycles() -> None:
+    bst = RedBlackTree(pool_size=4)
+    bst.insert(1)
+    bst.insert(1)
+    assert len(bst._pool) == 1
+    assert len(bst) == 1
+
+
+def test_custom_nodes_not_pooled() -> None:
+    bst = RedBlackTree(pool_size=4)
+    node = Node(5)
+    bst.insert(node)
+    bst.delete(5)
+    assert bst._pool == []
+    assert node.key == 5
+
+
+def test_popped_nodes_not_pooled() -> None:
+    bst = RedBlackTree(pool_size=4)
+    bst.insert_many([1, 2])
+    assert bst.pop_min().key == 1
+    assert bst._pool == []
+
+
+def test_no_pooling_with_subscribers() -> None:
+    bst = RedBlackTree(pool_size=4)
+    seen = []
+    bst.subscribe(lambda op, node: seen.append(node))
+    bst.insert(1)
+    bst.delete(1)
+    assert bst._pool == []
+    assert seen[-1].key == 1
+
+
+def test_removed_nodes_unlinked() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(10))
+    node = bst.search(5)
+    bst.delete(5)
+    assert node.parent.is_null()
+    assert node.left.is_null()
+    assert node.right.is_null()
+
+
+def test_churn() -> None:
+    random.seed(11)
+    bst = RedBlackTree(pool_size=16)
+    present = set()
+    for _ in range(2000):
+        key = random.randrange(200)
+        if key in present:
+            bst.delete(key)
+            present.discard(key)
+        else:
+            bst.insert(key)
+            present.add(key)
+    assert bst.is_valid()
+    assert [node.key for node in bst.inorder()] == sorted(present)
+
+
+def test_gc_freeze() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(100))
+    try:
+        bst.gc_freeze()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_compacted_tombstones_unlinked() -> None:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=1.0)
+    bst.insert_many(range(20))
+    tombstones = [bst.search(key) for key in range(0, 20, 2)]
+    bst.delete_many(range(0, 20, 2))
+    bst.compact()
+    for node in tombstones:
+        assert node.parent.is_null()
+        assert node.left.is_null()
+        assert node.right.is_null()
+    assert bst.is_valid()
+
+
+def test_range_deleted_tombstones_unlinked() -> None:
+    bst = RedBlackTree(lazy_delete=True, compact_ratio=1.0)
+    bst.insert_many(range(100))
+    tombstones = [bst.search(key) for key in (1, 3, 97, 99)]
+    doomed = list(bst.irange(10, 95))
+    bst.delete_many([1, 3, 97, 99])
+    assert bst.delete_range(10, 95) == 86
+    assert bst.tombstones == 0
+    for node in tombstones + doomed:
+        assert node.parent.is_null()
+        assert node.left.is_null()
+        assert node.right.is_null()
+    assert bst.is_valid()
+    expected = [0, 2, *range(4, 10), 96, 98]
+    assert [n.key for n in bst.inorder()] == expected
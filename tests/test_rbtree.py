@@ -1,6 +1,11 @@
+import array
+import copy
+import pickle
+import random
 import pytest
 from rbtree.rbtree import RedBlackTree
 from rbtree.node import Node
+from rbtree.node_base import NodeBase
 
 
 def three_tree() -> RedBlackTree:
@@ -514,3 +519,107 @@ def test_bad_color() -> None:
     one = Node(1)
     with pytest.raises(Exception):
         one.color = "blue"
+
+
+def test_random_delete() -> None:
+    random.seed(1)
+    bst = RedBlackTree()
+    keys = list(range(200))
+    random.shuffle(keys)
+    for key in keys:
+        bst.insert(key)
+    random.shuffle(keys)
+    for key in keys[:150]:
+        bst.delete(key)
+        assert bst.is_valid()
+    assert len(bst) == 50
+
+
+def test_pickle() -> None:
+    bst = RedBlackTree()
+    for i in range(100):
+        bst.insert(i)
+    clone = pickle.loads(pickle.dumps(bst))
+    assert clone.is_valid()
+    assert len(clone) == 100
+    assert [n.key for n in clone.inorder()] == list(range(100))
+    assert str(clone) == str(bst)
+    assert clone.search(0).left is NodeBase.NIL
+
+
+def test_pickle_nil() -> None:
+    assert pickle.loads(pickle.dumps(NodeBase.NIL)) is NodeBase.NIL
+    empty = pickle.loads(pickle.dumps(RedBlackTree()))
+    assert empty.root is NodeBase.NIL
+
+
+def test_pickle_deep_tree() -> None:
+    """
+    Pickling must not recurse through the node links.
+    """
+    bst = RedBlackTree()
+    for i in range(20000):
+        bst.insert(i)
+    clone = pickle.loads(pickle.dumps(bst))
+    assert len(clone) == 20000
+    assert clone.maximum().key == 19999
+
+
+def test_copy() -> None:
+    bst = RedBlackTree()
+    bst.insert([1])
+    bst.insert([2])
+    shallow = copy.copy(bst)
+    deep = copy.deepcopy(bst)
+    assert shallow.root is not bst.root
+    assert shallow.root.key is bst.root.key
+    assert deep.root.key is not bst.root.key
+    assert deep.root.key == bst.root.key
+    shallow.delete([1])
+    assert len(bst) == 2
+    assert bst.is_valid()
+    assert shallow.is_valid()
+
+
+def test_irange() -> None:
+    bst = RedBlackTree()
+    for i in range(0, 20, 2):
+        bst.insert(i)
+    assert [n.key for n in bst.irange(3, 9)] == [4, 6, 8]
+    assert [n.key for n in bst.irange(4, 8)] == [4, 6, 8]
+    assert [n.key for n in bst.irange(4, 8, (False, False))] == [6]
+    assert [n.key for n in bst.irange(hi=4)] == [0, 2, 4]
+    assert [n.key for n in bst.irange(15)] == [16, 18]
+    assert [n.key for n in bst.irange(3, 9, reverse=True)] == [8, 6, 4]
+    assert [n.key for n in bst.irange()] == list(range(0, 20, 2))
+    assert list(RedBlackTree().irange()) == []
+
+
+def test_search_many() -> None:
+    bst = RedBlackTree()
+    for i in range(0, 100, 3):
+        bst.insert(i)
+    probes = [50, 3, 4, 99, 0, 3, -1, 200, 51]
+    nodes = bst.search_many(probes)
+    for probe, node in zip(probes, nodes):
+        assert node is bst.search(probe)
+    assert bst.contains_many(probes) == [
+        False, True, False, True, True, True, False, False, True
+    ]
+
+
+def test_search_many_array() -> None:
+    bst = RedBlackTree()
+    for i in range(10):
+        bst.insert(i)
+    probes = array.array("q", [9, 2, 11])
+    assert bst.contains_many(probes) == [True, True, False]
+    assert bst.search_many(range(5, 12))[0].key == 5
+
+
+def test_search_many_nodes() -> None:
+    bst = three_tree()
+    nodes = bst.search_many([Node(3), Node(7)])
+    assert nodes[0].key == 3
+    assert nodes[1].is_null()
+    assert RedBlackTree().search_many([1]) == [NodeBase.NIL]
@@ -0,0 +1,96 @@
+import copy
+import pickle
+import pytest
+from rbtree.rbtree import DELETE, INSERT, RedBlackTree
+
+
+def keyed(changes: list) -> list:
+    return [(op, node.key) for op, node in changes]
+
+
+def test_diff() -> None:
+    primary = RedBlackTree()
+    primary.insert_many([1, 2, 3, 5, 8])
+    replica = RedBlackTree()
+    replica.insert_many([0, 2, 3, 4, 8, 9])
+    assert keyed(list(replica.diff(primary))) == [
+        (DELETE, 0), (INSERT, 1), (DELETE, 4), (INSERT, 5), (DELETE, 9)
+    ]
+
+
+def test_diff_same_tree() -> None:
+    bst = RedBlackTree()
+    bst.insert_many(range(5))
+    assert list(bst.diff(bst)) == []
+    assert list(bst.diff(copy.copy(bst))) == []
+
+
+def test_apply_diff() -> None:
+    primary = RedBlackTree()
+    primary.insert_many(range(0, 50, 3))
+    replica = RedBlackTree()
+    replica.insert_many(range(0, 50, 2))
+    replica.apply_changes(list(replica.diff(primary)))
+    assert [n.key for n in replica.inorder()] == list(range(0, 50, 3))
+    assert replica.is_valid()
+    assert replica.search(3) is not primary.search(3)
+
+
+def test_subscribe() -> None:
+    bst = RedBlackTree()
+    events: list = []
+    unsubscribe = bst.subscribe(lambda op, node: events.append((op, node)))
+    bst.insert(1)
+    bst.insert(1)
+    bst.insert(2)
+    bst.delete(1)
+    bst.delete(7)
+    assert keyed(events) == [(INSERT, 1), (INSERT, 2), (DELETE, 1)]
+    unsubscribe()
+    bst.insert(3)
+    assert len(events) == 3
+
+
+def test_subscribers_see_balanced_tree() -> None:
+    for lazy_delete in (False, True):
+        bst = RedBlackTree(lazy_delete=lazy_delete)
+        valid: list = []
+        bst.subscribe(lambda op, node: valid.append(bst.is_valid()))
+        bst.insert_many(range(50))
+        bst.delete_many(range(0, 50, 2))
+        bst.insert_many(range(0, 50, 4))
+        assert valid and all(valid)
+
+
+def test_failing_subscriber() -> None:
+    bst = RedBlackTree()
+
+    def fail(op: str, node: object) -> None:
+        raise RuntimeError("subscriber failed")
+
+    bst.subscribe(fail)
+    for key in range(10):
+        with pytest.raises(RuntimeError):
+            bst.insert(key)
+    assert len(bst) == 10
+    assert bst.is_valid()
+
+
+def test_change_stream() -> None:
+    primary = RedBlackTree(lazy_delete=True)
+    replica = RedBlackTree()
+    primary.subscribe(lambda op, node: replica.apply_changes([(op, node)]))
+    primary.insert_many(range(20))
+    primary.delete_many(range(0, 20, 3))
+    primary.insert(3)
+    assert [n.key for n in replica.inorder()] == [
+        n.key for n in primary.inorder()
+    ]
+    assert replica.is_valid()
+
+
+def test_subscribers_not_pickled() -> None:
+    bst = RedBlackTree()
+    bst.subscribe(lambda op, node: None)
+    clone = pickle.loads(pickle.dumps(bst))
+    assert clone._subscribers == []
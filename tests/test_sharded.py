@@ -0,0 +1,88 @@
+import random
+import pytest
+from rbtree.sharded import ShardedRedBlackTree
+
+
+def test_insert_and_contains() -> None:
+    with ShardedRedBlackTree(shards=3) as tree:
+        tree.insert_many(range(0, 300, 3))
+        assert len(tree) == 100
+        assert tree.contains_many([0, 1, 3, 299, 297]) == [
+            True, False, True, False, True
+        ]
+        assert 30 in tree
+        assert 31 not in tree
+
+
+def test_boundaries() -> None:
+    with ShardedRedBlackTree(boundaries=[10, 20]) as tree:
+        assert tree.shards == 3
+        tree.insert_many([5, 15, 25, 10, 20])
+        assert tree.shard_sizes() == [1, 2, 2]
+
+
+def test_irange() -> None:
+    keys = list(range(100))
+    random.shuffle(keys)
+    with ShardedRedBlackTree(shards=4) as tree:
+        tree.insert_many(keys)
+        assert list(tree) == list(range(100))
+        assert list(tree.irange(17, 63)) == list(range(17, 64))
+        assert list(tree.irange(17, 63, (False, False))) == list(range(18, 63))
+
+
+def test_delete() -> None:
+    with ShardedRedBlackTree(shards=2) as tree:
+        tree.insert_many(range(50))
+        tree.delete_many(range(0, 50, 2))
+        tree.delete(1)
+        assert len(tree) == 24
+        assert list(tree) == list(range(3, 50, 2))
+
+
+def test_rebalance() -> None:
+    with ShardedRedBlackTree(boundaries=[10, 20], skew=None) as tree:
+        tree.insert_many(range(100, 400))
+        assert tree.shard_sizes() == [0, 0, 300]
+        tree.rebalance()
+        assert tree.shard_sizes() == [100, 100, 100]
+        assert list(tree) == list(range(100, 400))
+
+
+def test_automatic_rebalance() -> None:
+    with ShardedRedBlackTree(shards=2) as tree:
+        tree.insert_many(range(10))
+        assert tree.shard_sizes() == [5, 5]
+        tree.insert_many(range(100, 200))
+        assert tree.shard_sizes() == [55, 55]
+        assert not tree.is_skewed()
+        tree.delete_many(range(100, 200))
+        assert tree.shard_sizes() == [5, 5]
+        assert list(tree) == list(range(10))
+
+
+def test_skew() -> None:
+    with ShardedRedBlackTree(boundaries=[10], skew=None) as tree:
+        tree.insert_many(range(20))
+        tree.delete_many(range(6))
+        assert tree.shard_sizes() == [4, 10]
+        assert not tree.is_skewed()
+        tree.skew = 3.0
+        assert not tree.is_skewed()
+        tree.skew = 2.0
+        assert tree.is_skewed()
+        tree.delete(19)
+        assert tree.shard_sizes() == [6, 7]
+    with pytest.raises(ValueError):
+        ShardedRedBlackTree(shards=2, skew=1.0)
+
+
+def test_worker_error() -> None:
+    with ShardedRedBlackTree(shards=1) as tree:
+        tree.insert(1)
+        with pytest.raises(TypeError):
+            tree.insert_many(["a"])
+        with pytest.raises(TypeError):
+            tree.insert_many([0, "a"])
+        assert len(tree) == 2
+        assert list(tree) == [0, 1]
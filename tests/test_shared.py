@@ -0,0 +1,92 @@
+import multiprocessing
+import pytest
+from rbtree.rbtree import RedBlackTree
+from rbtree.shared import SharedTree, SharedTreeWriter
+
+
+def read_keys(name: str, queue: multiprocessing.Queue) -> None:
+    with SharedTree(name) as shared:
+        queue.put((len(shared), list(shared.irange(2, 5))))
+
+
+def test_ints() -> None:
+    bst = RedBlackTree()
+    bst.insert_many([5, 1, 9, 3, 7])
+    with SharedTreeWriter() as writer:
+        assert writer.publish(bst) == 1
+        with SharedTree(writer.name) as shared:
+            assert len(shared) == 5
+            assert list(shared) == [1, 3, 5, 7, 9]
+            assert shared.search(7) == 7
+            assert shared.search(4) is None
+            assert 9 in shared
+            assert shared.floor(4) == 3
+            assert shared.ceiling(4) == 5
+            assert shared.floor(0) is None
+            assert shared.ceiling(10) is None
+            assert shared.minimum() == 1
+            assert shared.maximum() == 9
+            assert list(shared.irange(3, 7, (False, True))) == [5, 7]
+            assert list(shared.irange(hi=5, reverse=True)) == [5, 3, 1]
+
+
+def test_floats() -> None:
+    with SharedTreeWriter() as writer:
+        writer.publish([0.5, 1, 2.25])
+        with SharedTree(writer.name) as shared:
+            assert list(shared) == [0.5, 1.0, 2.25]
+            assert shared.floor(2) == 1.0
+
+
+def test_strings() -> None:
+    keys = sorted(["apple", "banana", "cherry", "été", "zebra"])
+    with SharedTreeWriter() as writer:
+        writer.publish(keys)
+        with SharedTree(writer.name) as shared:
+            assert list(shared) == keys
+            assert shared.search("été") == "été"
+            assert shared.search("fig") is None
+            assert shared.ceiling("c") == "cherry"
+            assert list(shared.irange("b", "d")) == ["banana", "cherry"]
+
+
+def test_unsupported_keys() -> None:
+    with SharedTreeWriter() as writer:
+        with pytest.raises(TypeError):
+            writer.publish([(1, 2)])
+        with pytest.raises(TypeError):
+            writer.publish([0.5, 2 ** 53 + 1])
+        with pytest.raises(TypeError):
+            writer.publish([0.5, 10 ** 400])
+        writer.publish([0.5, 2 ** 60])
+        with SharedTree(writer.name) as shared:
+            assert shared.search(2 ** 60) == 2 ** 60
+
+
+def test_swap() -> None:
+    with SharedTreeWriter() as writer:
+        writer.publish([1, 2, 3])
+        with SharedTree(writer.name) as shared:
+            iterator = iter(shared)
+            assert next(iterator) == 1
+            writer.publish([10, 20])
+            assert shared.version == 1
+            assert len(shared) == 2
+            assert shared.version == 2
+            # An iterator keeps reading the version it started on.
+            assert list(iterator) == [2, 3]
+            writer.publish([])
+            writer.publish(["a"])
+            assert list(shared) == ["a"]
+            assert len(shared) == 1
+
+
+def test_other_process() -> None:
+    ctx = multiprocessing.get_context("spawn")
+    with SharedTreeWriter() as writer:
+        writer.publish(range(10))
+        queue = ctx.Queue()
+        process = ctx.Process(target=read_keys, args=(writer.name, queue))
+        process.start()
+        assert queue.get(timeout=30) == (10, [2, 3, 4, 5])
+        process.join()